@@ -0,0 +1,207 @@
+import numpy as np
+from quantum_tictactoe.engine import X, Y, LINES
+
+MAX_NUMBER = 40
+DRAW = 2
+LINE_TILES = np.array(LINES)
+
+
+class BatchEngine:
+    """
+    Many random games played in lockstep on NumPy arrays.
+    All games make move of the same round number together,
+    so round number is also index of move in arrays.
+    Collapse and winner follow BoardEngine rules exactly.
+    :param games: number of games
+    :type games: int
+
+    :param seed: seed of NumPy generator, default to None
+    :type seed: int
+
+    :param owner: collapsed move code of every game and tile, -1 if not collapsed
+    :type owner: numpy.ndarray
+
+    :param ends: tiles with spooky mark of every game and round number,
+        in order of placing, -1 for removed mark
+    :type ends: numpy.ndarray
+
+    :param winner: X, Y, DRAW of every game or -1 if game is not finished
+    :type winner: numpy.ndarray
+
+    :param pairs: tiles of move of every game and round number, -1 if none
+    :type pairs: numpy.ndarray
+
+    :param collapses: (tile, move) collapsed after move of every game
+        and round number, -1 if none
+    :type collapses: numpy.ndarray
+    """
+    def __init__(self, games, seed=None):
+        self.games = games
+        self.number = 0
+        self.owner = np.full((games, 9), -1, dtype=np.int16)
+        self.ends = np.full((games, MAX_NUMBER + 1, 2), -1, dtype=np.int8)
+        self.labels = np.tile(np.arange(9, dtype=np.int8), (games, 1))
+        self.winner = np.full(games, -1, dtype=np.int8)
+        self.win_line = np.full(games, -1, dtype=np.int8)
+        self.pairs = np.full((games, MAX_NUMBER + 1, 2), -1, dtype=np.int8)
+        self.collapses = np.full((games, MAX_NUMBER + 1, 2), -1, dtype=np.int16)
+        self._rng = np.random.default_rng(seed)
+
+    def active(self):
+        """
+        Returns bool array of games which are not finished
+        """
+        return self.winner < 0
+
+    def run(self):
+        """
+        Plays all games to the end
+        """
+        while self.active().any():
+            self.step()
+
+    def step(self):
+        """
+        Plays one random move in every active game,
+        collapses games where the move closed a cycle and checks their winners
+        """
+        games = np.flatnonzero(self.active())
+        if len(games) == 0:
+            return
+        self.number += 1
+        number = self.number
+        if number > MAX_NUMBER:
+            raise ValueError('Game is longer than MAX_NUMBER rounds')
+        rows = np.arange(len(games))
+        free = self.owner[games] < 0
+        keys = self._rng.random((len(games), 9))
+        keys[~free] = -1.0
+        order = np.argsort(-keys, axis=1)
+        first, second = order[:, 0], order[:, 1]
+        self.ends[games, number, 0] = first
+        self.ends[games, number, 1] = second
+        self.pairs[games, number, 0] = first
+        self.pairs[games, number, 1] = second
+        labels = self.labels[games]
+        first_label = labels[rows, first]
+        second_label = labels[rows, second]
+        cycle = first_label == second_label
+        join = ~cycle
+        labels[join] = np.where(labels[join] == second_label[join, None],
+                                first_label[join, None], labels[join])
+        self.labels[games] = labels
+        cycle_games = games[cycle]
+        if len(cycle_games):
+            component = (labels[cycle] == first_label[cycle, None]) & free[cycle]
+            tiles, moves = self._choose_collapse(cycle_games, component)
+            self.collapses[cycle_games, number, 0] = tiles
+            self.collapses[cycle_games, number, 1] = moves
+            self._collapse(cycle_games, tiles, moves)
+            self._relabel(cycle_games)
+            self._check_winner(cycle_games)
+
+    def _choose_collapse(self, games, component):
+        """
+        Returns random (tile, move) of every game,
+        the same choices as Board.could_collapse allows:
+        marks with both tiles on the cycle of component
+        """
+        rows = np.arange(len(games))
+        ends = self.ends[games].astype(np.intp)
+        held = ends >= 0
+        safe = np.where(held, ends, 0)
+        on_tile = held[..., None] & (safe[..., None] == np.arange(9))
+        cycle = component
+        while True:
+            inside = held & cycle[rows[:, None, None], safe]
+            options = inside & inside[:, :, ::-1]
+            degree = (on_tile & options[..., None]).sum(axis=(1, 2))
+            peeled = cycle & (degree >= 2)
+            if (peeled == cycle).all():
+                break
+            cycle = peeled
+        keys = self._rng.random(options.shape)
+        keys[~options] = -1.0
+        numbers, sides = np.divmod(keys.reshape(len(games), -1).argmax(axis=1), 2)
+        return ends[rows, numbers, sides], move_codes(numbers)
+
+    def _collapse(self, games, tiles, moves):
+        """
+        Collapses moves on tiles and goes through spooky marks
+        in the same order as BoardEngine.collapse
+        """
+        count = len(games)
+        queue = np.zeros((count, 2 * MAX_NUMBER + 3, 2), dtype=np.int16)
+        queue[:, 0, 0] = tiles
+        queue[:, 0, 1] = moves
+        head = np.zeros(count, dtype=np.intp)
+        tail = np.ones(count, dtype=np.intp)
+        numbers = np.arange(MAX_NUMBER + 1)
+        while True:
+            running = np.flatnonzero(head < tail)
+            if len(running) == 0:
+                break
+            entry = queue[running, head[running]]
+            head[running] += 1
+            tile = entry[:, 0].astype(np.intp)
+            move = entry[:, 1]
+            is_open = self.owner[games[running], tile] < 0
+            running, tile, move = running[is_open], tile[is_open], move[is_open]
+            if len(running) == 0:
+                continue
+            rows = games[running]
+            self.owner[rows, tile] = move
+            ends = self.ends[rows]
+            on_tile = ends == tile[:, None, None]
+            marks = on_tile.any(axis=2) & (numbers != move[:, None] >> 1)
+            ends[on_tile] = -1
+            self.ends[rows] = ends
+            others = (marks[:, :, None] & (ends >= 0)).reshape(len(running), -1)
+            slots = tail[running, None] + np.cumsum(others, axis=1) - 1
+            index, column = np.nonzero(others)
+            target, slot = running[index], slots[index, column]
+            queue[target, slot, 0] = ends.reshape(len(running), -1)[index, column]
+            queue[target, slot, 1] = move_codes(column // 2)
+            tail[running] += others.sum(axis=1)
+
+    def _relabel(self, games):
+        """
+        Builds components of tiles again from spooky marks which are left
+        """
+        labels = np.tile(np.arange(9, dtype=np.int8), (len(games), 1))
+        ends = self.ends[games].astype(np.intp)
+        rows, numbers = np.nonzero((ends >= 0).all(axis=2))
+        first = ends[rows, numbers, 0]
+        second = ends[rows, numbers, 1]
+        for _ in range(8):
+            low = np.minimum(labels[rows, first], labels[rows, second])
+            np.minimum.at(labels, (rows, first), low)
+            np.minimum.at(labels, (rows, second), low)
+        self.labels[games] = labels
+
+    def _check_winner(self, games):
+        """
+        Sets winners of games like BoardEngine.result,
+        the lowest round number on the line wins
+        """
+        owner = self.owner[games][:, LINE_TILES]
+        players = np.where(owner >= 0, owner & 1, -1)
+        full_x = (players == X).all(axis=2)
+        full_y = (players == Y).all(axis=2)
+        full = full_x | full_y
+        subscript = np.where(full, owner.min(axis=2) >> 1, MAX_NUMBER + 1)
+        line = len(LINES) - 1 - subscript[:, ::-1].argmin(axis=1)
+        rows = np.arange(len(games))
+        has_line = full.any(axis=1)
+        winner = np.where(full_x[rows, line], X, Y)
+        draw = (self.owner[games] >= 0).sum(axis=1) >= 8
+        self.winner[games] = np.where(has_line, winner, np.where(draw, DRAW, -1))
+        self.win_line[games] = np.where(has_line, line, -1)
+
+
+def move_codes(numbers):
+    """
+    Returns move codes of round numbers, X moves in odd rounds
+    """
+    numbers = np.asarray(numbers)
+    return numbers * 2 + ((numbers + 1) & 1)
@@ -0,0 +1,187 @@
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+import json
+import sys
+from quantum_tictactoe.bot import Bot
+from quantum_tictactoe.engine import BoardEngine
+from quantum_tictactoe.mcts import actions, apply
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.record import new_game
+from quantum_tictactoe.simulate import Simulator
+
+CORPORA = ('sparse', 'dense', 'entanglement', 'near_end')
+HIGHER_IS_BETTER = ('games_per_second',)
+
+
+def corpus_kind(position):
+    """
+    Returns corpus name of position or None if it fits no corpus
+    """
+    engine = position.engine
+    if position.half >= 0 or position.is_finished():
+        return None
+    if position.pending >= 0:
+        return 'entanglement' if bin(engine.entangled).count('1') >= 4 else None
+    if engine.not_collapsed() <= 4:
+        return 'near_end'
+    marks = sum(bin(mask).count('1') for mask in engine.spooky)
+    if engine.not_collapsed() == 9 and marks <= 4:
+        return 'sparse'
+    if marks >= 8:
+        return 'dense'
+    return None
+
+
+def make_corpora(size=50, seed=0):
+    """
+    Returns dict of corpus name and list of packed positions
+    found in random games of generator seeded with seed
+    """
+    rng = Random(seed)
+    corpora = {name: [] for name in CORPORA}
+    seen = set()
+    while any(len(corpus) < size for corpus in corpora.values()):
+        position = Position(BoardEngine())
+        while not position.is_finished():
+            kind = corpus_kind(position)
+            if kind is not None and len(corpora[kind]) < size and position.key() not in seen:
+                seen.add(position.key())
+                corpora[kind].append(position.pack())
+            choices = actions(position)
+            if not choices:
+                break
+            apply(position, rng.choice(choices))
+    return corpora
+
+
+def load_game(game, packed):
+    """
+    Sets game to packed position and returns it
+    """
+    game.load(Position.unpack(packed))
+    return game
+
+
+def time_calls(packed_positions, prepare, call, repeat=1):
+    """
+    Runs call on every position prepared by prepare and returns
+    dict with calls, seconds and microseconds per call.
+    Only call is timed.
+    """
+    game = new_game()
+    calls = 0
+    seconds = 0.0
+    for _ in range(repeat):
+        for packed in packed_positions:
+            argument = prepare(load_game(game, packed))
+            start = perf_counter()
+            call(argument)
+            seconds += perf_counter() - start
+            calls += 1
+    return {'calls': calls, 'seconds': seconds,
+            'per_call_us': seconds / calls * 1e6 if calls else 0.0}
+
+
+def _collapse_option(game):
+    return game, game.board.collapse_options()[0]
+
+
+def _uncached_board(game):
+    # Game.load checks game end, so result of engine is already cached
+    game.board.engine().clear_result()
+    return game.board
+
+
+def _bot(mode, **options):
+    def prepare(game):
+        return Bot(mode, game.board, game, rng=Random(0), **options)
+    return prepare
+
+
+def run_benchmarks(size=50, seed=0, repeat=3, games=200):
+    """
+    Returns dict with results of every benchmark
+    """
+    corpora = make_corpora(size, seed)
+    everything = [packed for name in CORPORA for packed in corpora[name]]
+    entangled = corpora['entanglement']
+    open_positions = corpora['sparse'] + corpora['dense'] + corpora['near_end']
+    results = {
+        'board_collapse': time_calls(
+            entangled, _collapse_option,
+            lambda args: args[0].board.collapse(*args[1]), repeat),
+        'game_is_entanglement': time_calls(
+            corpora['dense'] + entangled, lambda game: game,
+            lambda game: game.is_entanglement(), repeat),
+        'board_is_winner': time_calls(
+            everything, _uncached_board,
+            lambda board: board.is_winner(), repeat),
+        'board_show_board': time_calls(
+            everything, lambda game: game.board,
+            lambda board: board.show_board(), repeat),
+        'bot_move_easy': time_calls(
+            open_positions, _bot('easy'), lambda bot: bot.move(), repeat),
+        'bot_move_hard': time_calls(
+            open_positions, _bot('hard', depth=2), lambda bot: bot.move(), 1),
+        'bot_collapse_easy': time_calls(
+            entangled, _bot('easy'), lambda bot: bot.collapse(), repeat),
+        'bot_collapse_hard': time_calls(
+            entangled, _bot('hard', depth=2), lambda bot: bot.collapse(), 1),
+    }
+    simulator = Simulator('easy', 'easy', seed=seed)
+    try:
+        simulator.run(games)
+    finally:
+        simulator.close()
+    results['games_per_second'] = simulator.report()['games_per_second']
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Returns list of (name, result, baseline) of benchmarks slower
+    than baseline by more than threshold
+    """
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        if name in HIGHER_IS_BETTER:
+            if value < old * (1 - threshold):
+                regressions.append((name, value, old))
+        elif value['per_call_us'] > old['per_call_us'] * (1 + threshold):
+            regressions.append((name, value['per_call_us'], old['per_call_us']))
+    return regressions
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Measures speed of rules engine and bots')
+    parser.add_argument('--size', type=int, default=50, help='positions in every corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--output', default=None, help='path of JSON results')
+    parser.add_argument('--baseline', default=None, help='path of JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    results = run_benchmarks(args.size, args.seed, args.repeat, args.games)
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as handle:
+            handle.write(text)
+    if args.baseline is not None:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline, args.threshold)
+        for name, value, old in regressions:
+            print(f'{name}: {value:.2f} against baseline {old:.2f}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,15 @@
+from quantum_tictactoe.engine import BoardEngine, X, Y, PLAYERS, LINES
+from quantum_tictactoe.engine import format_move, move_player, iter_bits
+
+
 class InvalidCollapseError(Exception):
     pass
 
 
 class Board:
     """
-    Board class. Contains all tiles in game and list of tiles in entanglement
+    Board class. Contains all tiles in game and list of tiles in entanglement.
+    State of tiles is kept in compact BoardEngine, tiles are its view.
     :param tiles: Tiles in game
     :type tiles: list
 
@@ -14,7 +19,9 @@ class Board:
     """
     def __init__(self, tiles: list):
         self._tiles = tiles
-        self._entangl_tiles = []
+        self._engine = BoardEngine()
+        for index, tile in enumerate(tiles):
+            tile.bind(self._engine, index)
 
     def tiles(self):
         """
@@ -22,6 +29,12 @@ class Board:
         """
         return self._tiles
 
+    def engine(self):
+        """
+        Returns BoardEngine with state of the board
+        """
+        return self._engine
+
     def show_board(self):
         """
         Returns string represent of board which could be print in terminal
@@ -34,7 +47,7 @@ class Board:
                 in_tile = '' if not tile.is_entanglement() else '*'
                 for index, element in enumerate(tile.array()):
                     coma = '' if index == 0 else ', '
-                    in_tile += f'{coma}{element}'
+                    in_tile += f'{coma}{format_move(element)}'
                 display += f'{in_tile:^{24}}{wall}'
             line_len = 78
             floor = '-'*line_len if row in [0, 3] else ''
@@ -46,56 +59,67 @@ class Board:
         """
         Returns list of tiles numbers which are in entanglement
         """
-        return self._entangl_tiles
+        return list(iter_bits(self._engine.entangled))
 
     def add_entangl_tile(self, tile):
         """
         Add number of tile which is in entanglement
         and set tile entanglemet to True
         """
-        self._entangl_tiles.append(tile)
-        self._tiles[tile].set_is_entanglement(True)
+        self._engine.set_entangled(tile, True)
 
     def reset_entangl_tiles(self):
         """
         Reset list of tiles in entanglemet
         """
-        for tile in self._entangl_tiles:
-            self._tiles[tile].set_is_entanglement(False)
-        self._entangl_tiles = []
+        self._engine.entangled = 0
+
+    def tiles_with_move(self, move):
+        """
+        Returns tuple of not collapsed tiles numbers with move
+        """
+        return self._engine.tiles_with(move)
+
+    def cycle_component(self, move):
+        """
+        Returns list of tiles numbers connected with cycle closed by move,
+        empty list if move did not close a cycle
+        """
+        return list(iter_bits(self._engine.cycle_component(move)))
+
+    def collapse_options(self):
+        """
+        Returns list of (tile, move) which could collapse now,
+        options are computed once for every entanglement
+        """
+        return self._engine.collapse_options()
+
+    def collapse_preview(self, tile, what_collapse):
+        """
+        Returns list of collapsed moves of every tile after collapse
+        of what_collapse on tile, None for tiles which stay not collapsed.
+        Board is not changed.
+        """
+        preview = self._engine.collapse_preview(tile, what_collapse)
+        return [move if move >= 0 else None for move in preview]
 
     def could_collapse(self, tile, what_collapse):
         """
         Returns if choosen move could collapse
         """
-        can_collapse = False
-        if tile not in self._entangl_tiles:
+        if tile not in range(0, 9):
+            raise InvalidCollapseError('Tiles are numbering from 0 to 8')
+        if not self._engine.is_entangled(tile):
             raise InvalidCollapseError('You could collapse only tiles with *')
-        for entile in self._entangl_tiles:
-            if entile != tile:
-                if what_collapse in self._tiles[entile].array():
-                    can_collapse = True
-        return can_collapse
+        return self._engine.is_collapse_option(tile, what_collapse)
 
     def collapse(self, tile, what_collapse):
         """
-        Changes tiles state to collapsed if its possible
+        Changes tiles state to collapsed if its possible.
+        Returns list of (tile, move) of tiles which became collapsed
         """
         if self.could_collapse(tile, what_collapse):
-            ctile = self._tiles[tile]
-            moves_to_collapse = []
-            for move in ctile.array():
-                if move not in moves_to_collapse and move != what_collapse:
-                    moves_to_collapse.append(move)
-            ctile.set_collapsed(what_collapse)
-            for move in moves_to_collapse:
-                for tile in self._tiles:
-                    if move in tile.array():
-                        for an_move in tile.array():
-                            not_repeat = an_move not in moves_to_collapse
-                            if not_repeat and an_move != move:
-                                moves_to_collapse.append(an_move)
-                        tile.set_collapsed(move)
+            return self._engine.collapse(tile, what_collapse)
         else:
             raise InvalidCollapseError("""Cannot collapse it.
 You must choose move which is on two tiles in entanglement""")
@@ -103,64 +127,25 @@ You must choose move which is on two tiles in entanglement""")
     def analyse_board(self):
         """
         Analyses the board,
-        returns list of collapsed tiles,
-        if tile is not collapsed append "-" to list
-        """
-        coll_moves = []
-        for tile_number in range(9):
-            if self._tiles[tile_number].is_collapsed():
-                move = self._tiles[tile_number].array()[0]
-                coll_moves.append(move)
-            else:
-                coll_moves.append('-')
-        return coll_moves
+        returns list of collapsed moves,
+        if tile is not collapsed append None to list
+        """
+        return [move if move >= 0 else None for move in self._engine.owner]
 
     def win_options(self, coll_moves):
         """
-        Create list of winning options and tiles and returns it
+        Create list of winning options and tiles and returns it.
+        Winning option is the move with the lowest round number in line.
         """
         win_options = []
         win_tiles = []
-        if coll_moves[0][0] == coll_moves[1][0] == coll_moves[2][0]:
-            if coll_moves[0] != '-':
-                win = coll_moves[0][0] + min(coll_moves[0][1], coll_moves[1][1], coll_moves[2][1])
-                win_options.append(win)
-                win_tiles.append([0, 1, 2])
-        if coll_moves[0][0] == coll_moves[3][0] == coll_moves[6][0]:
-            if coll_moves[0] != '-':
-                win = coll_moves[0][0] + min(coll_moves[0][1], coll_moves[3][1], coll_moves[6][1])
-                win_options.append(win)
-                win_tiles.append([0, 3, 6])
-        if coll_moves[0][0] == coll_moves[4][0] == coll_moves[8][0]:
-            if coll_moves[0] != '-':
-                win = coll_moves[0][0] + min(coll_moves[0][1], coll_moves[4][1], coll_moves[8][1])
-                win_options.append(win)
-                win_tiles.append([0, 4, 8])
-        if coll_moves[1][0] == coll_moves[4][0] == coll_moves[7][0]:
-            if coll_moves[1] != '-':
-                win = coll_moves[1][0] + min(coll_moves[1][1], coll_moves[4][1], coll_moves[7][1])
-                win_options.append(win)
-                win_tiles.append([1, 4, 7])
-        if coll_moves[2][0] == coll_moves[5][0] == coll_moves[8][0]:
-            if coll_moves[2] != '-':
-                win = coll_moves[2][0] + min(coll_moves[2][1], coll_moves[5][1], coll_moves[8][1])
-                win_options.append(win)
-                win_tiles.append([2, 5, 8])
-        if coll_moves[3][0] == coll_moves[4][0] == coll_moves[5][0]:
-            if coll_moves[3] != '-':
-                win = coll_moves[3][0] + min(coll_moves[3][1], coll_moves[4][1], coll_moves[5][1])
-                win_options.append(win)
-                win_tiles.append([3, 4, 5])
-        if coll_moves[6][0] == coll_moves[7][0] == coll_moves[8][0]:
-            if coll_moves[6] != '-':
-                win = coll_moves[6][0] + min(coll_moves[6][1], coll_moves[7][1], coll_moves[8][1])
-                win_options.append(win)
-                win_tiles.append([6, 7, 8])
-        if coll_moves[2][0] == coll_moves[4][0] == coll_moves[6][0]:
-            if coll_moves[2] != '-':
-                win = coll_moves[2][0] + min(coll_moves[2][1], coll_moves[4][1], coll_moves[6][1])
-                win_options.append(win)
-                win_tiles.append([2, 4, 6])
+        for line in LINES:
+            moves = [coll_moves[tile] for tile in line]
+            if None in moves:
+                continue
+            if move_player(moves[0]) == move_player(moves[1]) == move_player(moves[2]):
+                win_options.append(min(moves))
+                win_tiles.append(list(line))
         return win_options, win_tiles
 
     def is_winner(self):
@@ -168,24 +153,14 @@ You must choose move which is on two tiles in entanglement""")
         If there is a winner, function returns
         who is it and winning tiles. If there is no winner, returns unknown
         """
-        coll_moves = self.analyse_board()
-        not_collapsed = coll_moves.count('-')
-        win_options, win_tiles = self.win_options(coll_moves)
-        if len(win_options) == 1:
-            return win_options[0][0], win_tiles[0]
-        elif len(win_options) > 1:
-            min_opt = 40
-            winner = ''
-            winner_tiles = []
-            for opt in win_options:
-                if int(opt[1]) < min_opt:
-                    min_opt = int(opt[1])
-            for (opt, tiles) in zip(win_options, win_tiles):
-                if int(opt[1]) == min_opt:
-                    winner = opt[0]
-                    winner_tiles = tiles
-            return winner, winner_tiles
-        elif win_options == [] and (not_collapsed == 0 or not_collapsed == 1):
-            return 'unknown', []
-        else:
-            return None, []
+        winner, tiles = self._engine.winner()
+        if winner in (X, Y):
+            return PLAYERS[winner], tiles
+        return winner, tiles
+
+    def win_subscript(self):
+        """
+        Returns the lowest round number on winning line,
+        None if there is no winner
+        """
+        return self._engine.result()[2]
@@ -0,0 +1,139 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from struct import Struct
+from quantum_tictactoe.engine import BoardEngine
+from quantum_tictactoe.mcts import actions, apply
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.search import AlphaBeta
+from quantum_tictactoe.symmetry import canonical, canonical_key, unmap_action
+
+MAGIC = b'QTTB'
+HEADER = Struct('<4sIQ')
+ENTRY = Struct('<Qbb')
+
+
+class BookError(Exception):
+    pass
+
+
+def write_book(path, entries):
+    """
+    Writes dict of canonical key and action of canonical position to path
+    """
+    with open(path, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, 1, len(entries)))
+        for key in sorted(entries):
+            handle.write(ENTRY.pack(key, *entries[key]))
+
+
+def read_book(path):
+    """
+    Returns dict of canonical key and action written by write_book
+    """
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != 1:
+        raise BookError(f'{path} is not opening book')
+    end = HEADER.size + count * ENTRY.size
+    entries = {}
+    for key, first, second in ENTRY.iter_unpack(data[HEADER.size:end]):
+        entries[key] = (first, second)
+    return entries
+
+
+class OpeningBook:
+    """
+    Moves and collapses chosen offline for the first plies of the game,
+    keyed by canonical position. File is read at the first lookup.
+    :param path: path of book file made by write_book
+    :type path: str
+    """
+    def __init__(self, path):
+        self._path = path
+        self._entries = None
+
+    def __len__(self):
+        return len(self._load())
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = read_book(self._path)
+        return self._entries
+
+    def action(self, position):
+        """
+        Returns book move or collapse of position or None
+        """
+        key, transform = canonical_key(position)
+        action = self._load().get(key)
+        if action is None:
+            return None
+        return unmap_action(action, transform, position)
+
+
+def book_entry(packed, depth, node_limit):
+    """
+    Searches packed canonical position and returns its best action
+    """
+    position = Position.unpack(packed)
+    search = AlphaBeta(depth, node_limit)
+    if position.pending >= 0:
+        return search.best_collapse(position)
+    return search.best_move(position)
+
+
+def build_book(plies=2, depth=3, node_limit=20000, workers=1, position=None):
+    """
+    Returns entries of book for every canonical position reached
+    in less than plies moves and collapses from position,
+    default to empty board. Every position is searched by AlphaBeta.
+    """
+    position = Position(BoardEngine()) if position is None else position
+    level = {canonical_key(position)[0]: canonical(position)[0]}
+    entries = {}
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for ply in range(plies):
+            keys = [key for key in level if key not in entries]
+            packed = [level[key].pack() for key in keys]
+            if pool is None:
+                found = [book_entry(data, depth, node_limit) for data in packed]
+            else:
+                found = list(pool.map(book_entry, packed, [depth] * len(packed),
+                                      [node_limit] * len(packed)))
+            entries.update(zip(keys, found))
+            if ply == plies - 1:
+                break
+            next_level = {}
+            for node in level.values():
+                for action in actions(node):
+                    child = node.copy()
+                    apply(child, action)
+                    if child.is_finished():
+                        continue
+                    key = canonical_key(child)[0]
+                    if key not in next_level and key not in entries:
+                        next_level[key] = canonical(child)[0]
+            level = next_level
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return entries
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Builds opening book')
+    parser.add_argument('book', help='path of book file')
+    parser.add_argument('--plies', type=int, default=2)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--node-limit', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+    entries = build_book(args.plies, args.depth, args.node_limit, args.workers)
+    write_book(args.book, entries)
+    print(f'{len(entries)} positions written to {args.book}')
+
+
+if __name__ == '__main__':
+    main()
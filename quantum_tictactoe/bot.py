@@ -1,4 +1,8 @@
-from random import choice
+from random import choice, Random
+from quantum_tictactoe.engine import X, move_player
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.search import AlphaBeta
+from quantum_tictactoe.mcts import MCTS, ParallelMCTS
 
 
 class BotTypeError(Exception):
@@ -17,16 +21,55 @@ class Bot:
 
     :param game: Game in play
     :type game: Game
+
+    :param depth: search depth of hard bot, default to 3
+    :type depth: int
+
+    :param node_limit: maximal number of nodes searched by hard bot in one move
+    :type node_limit: int
+
+    :param time_limit: maximal time in seconds of hard or mcts bot move, default to None
+    :type time_limit: float
+
+    :param iterations: number of playouts of mcts bot in one move, default to 2000
+    :type iterations: int
+
+    :param workers: number of processes searching for mcts bot, default to 1
+    :type workers: int
+
+    :param rng: random generator of the bot, default to module random functions
+    :type rng: Random
+
+    :param database: solved positions which hard and mcts bot play
+        without search, default to None
+    :type database: PositionDatabase
+
+    :param book: opening book which hard and mcts bot use before
+        database and search, default to None
+    :type book: OpeningBook
     """
-    def __init__(self, mode, board, game):
+    def __init__(self, mode, board, game, depth=3, node_limit=20000, time_limit=None,
+                 iterations=2000, workers=1, rng=None, database=None,
+                 book=None):
         # if mode == 'hard':
         #     raise BotTypeError('Hard bot is not available yet')
-        if mode not in ['none', 'easy', 'hard']:
-            err = 'You must choose bot type between none/easy/hard'
+        if mode not in ['none', 'easy', 'hard', 'mcts']:
+            err = 'You must choose bot type between none/easy/hard/mcts'
             raise BotTypeError(err)
         self._mode = mode
         self._board = board
         self._game = game
+        self._rng = rng
+        self._database = database
+        self._book = book
+        if mode == 'mcts' and workers > 1:
+            seed = None if rng is None else rng.getrandbits(32)
+            self._search = ParallelMCTS(workers, iterations, time_limit, seed)
+        elif mode == 'mcts':
+            search_rng = None if rng is None else Random(rng.getrandbits(64))
+            self._search = MCTS(iterations, time_limit, search_rng)
+        else:
+            self._search = AlphaBeta(depth, node_limit, time_limit)
 
     def mode(self):
         """
@@ -34,6 +77,44 @@ class Bot:
         """
         return self._mode
 
+    def choice(self, options):
+        """
+        Returns random element of options using generator of the bot
+        """
+        if self._rng is None:
+            return choice(options)
+        return self._rng.choice(options)
+
+    def close(self):
+        """
+        Stops worker processes of mcts bot with many workers,
+        they are started again by the next search
+        """
+        if isinstance(self._search, ParallelMCTS):
+            self._search.close()
+
+    def search_stats(self):
+        """
+        Returns dict with statistics of last hard or mcts bot search
+        """
+        return self._search.stats()
+
+    def _best(self, position):
+        """
+        Returns action of position from book, database or found by search
+        """
+        if self._book is not None:
+            action = self._book.action(position)
+            if action is not None:
+                return action
+        if self._database is not None:
+            action = self._database.best_action(position)
+            if action is not None:
+                return action
+        if position.pending >= 0:
+            return self._search.best_collapse(position)
+        return self._search.best_move(position)
+
     def move(self):
         """
         Returns tuple of choosen tiles to set move on
@@ -47,20 +128,11 @@ class Bot:
             tile_to_move_1 = self.choose_move(available_tiles)
             available_tiles.remove(tile_to_move_1)
             tile_to_move_2 = self.choose_move(available_tiles)
-        elif self._mode == 'hard':
-            tile_to_move_1 = self.choose_move(available_tiles)
-            available_tiles.remove(tile_to_move_1)
-            available_tiles_2 = []
-            for index, tile in enumerate(self._board.tiles()):
-                if tile.array() == []:
-                    available_tiles_2.append(index)
-            tiles_with_y = self.tiles_y()
-            if len(available_tiles_2) > 0:
-                tile_to_move_2 = self.choose_move(available_tiles_2)
-            elif len(tiles_with_y) > 0:
-                tile_to_move_2 = self.choose_move(tiles_with_y)
-            else:
-                tile_to_move_2 = self.choose_move(available_tiles)
+        elif self._mode in ['hard', 'mcts']:
+            position = Position.from_game(self._game)
+            tile_to_move_1, tile_to_move_2 = self._best(position)
+            self.set_move(tile_to_move_1)
+            self.set_move(tile_to_move_2)
         return tile_to_move_1, tile_to_move_2
 
     def tiles_y(self):
@@ -71,7 +143,7 @@ class Bot:
         for index, tile in enumerate(self._board.tiles()):
             only = True
             for move in tile.array():
-                if 'x' in move:
+                if move_player(move) == X:
                     only = False
             if only:
                 only_y.append(index)
@@ -82,24 +154,23 @@ class Bot:
         Chooses and returns tile to move from avaiable_tiles
         Makes move
         """
-        tile_to_move = choice(available_tiles)
-        move = self._game.whos_move()
-        self._board.tiles()[tile_to_move].set_move_on_tile(move)
+        tile_to_move = self.choice(available_tiles)
+        self.set_move(tile_to_move)
         return tile_to_move
 
+    def set_move(self, tile):
+        """
+        Makes move on tile
+        """
+        move = self._game.whos_move()
+        self._board.tiles()[tile].set_move_on_tile(move)
+
     def collapse(self):
         """
         Choices what move on which tile will collapse.
-        Returns string: tile_number,move_to_collapse
-        """
-        available_tiles = self._board.entangl_tiles()
-        if self._mode == 'easy' or self._mode == 'hard':
-            while True:
-                tile_nr = choice(available_tiles)
-                num_of_moves = len(self._board.tiles()[tile_nr].array())
-                move_to_collapse = choice(range(num_of_moves))
-                move_to_collapse = self._board.tiles()[tile_nr].array()[move_to_collapse]
-                if self._board.could_collapse(tile_nr, move_to_collapse):
-                    return f'{tile_nr},{move_to_collapse}'
-        elif self._mode == 'hard':
-            pass
+        Returns tuple: (tile_number, move_to_collapse)
+        """
+        if self._mode in ['hard', 'mcts']:
+            position = Position.from_game(self._game)
+            return self._best(position)
+        return self.choice(self._board.collapse_options())
@@ -0,0 +1,129 @@
+from argparse import ArgumentParser
+from bisect import bisect_left
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from quantum_tictactoe.mcts import actions, apply
+from quantum_tictactoe.solver import WIN, DRAW, LOSS, load_memo
+from quantum_tictactoe.symmetry import canonical_key
+
+MAGIC = b'QTTD'
+HEADER = Struct('<4sIQ')
+
+
+class DatabaseError(Exception):
+    pass
+
+
+def write_database(path, values):
+    """
+    Writes dict of canonical key and value to path as header,
+    sorted keys (uint64) and their values (int8)
+    """
+    keys = sorted(values)
+    with open(path, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, 1, len(keys)))
+        handle.write(Struct(f'<{len(keys)}Q').pack(*keys))
+        handle.write(Struct(f'<{len(keys)}b').pack(*(values[key] for key in keys)))
+
+
+class PositionDatabase:
+    """
+    Read only database of solved positions in file made by write_database.
+    File is mapped into memory, so processes which open the same file
+    share its pages and opening does not read it.
+    Value is WIN, DRAW or LOSS of player to move like in Solver.
+    :param path: path of database file
+    :type path: str
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as handle:
+            self._map = mmap(handle.fileno(), 0, access=ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != 1:
+            self._map.close()
+            raise DatabaseError(f'{path} is not position database')
+        start = HEADER.size
+        self._count = count
+        self._keys = memoryview(self._map)[start:start + 8 * count].cast('Q')
+        self._values = memoryview(self._map)[start + 8 * count:start + 9 * count].cast('b')
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key):
+        """
+        Returns value of canonical key or None if it is not in database
+        """
+        index = bisect_left(self._keys, key)
+        if index < self._count and self._keys[index] == key:
+            return self._values[index]
+        return None
+
+    def value(self, position):
+        """
+        Returns value of position for player to move or None,
+        finished games are valued as in Solver
+        """
+        if position.pending < 0:
+            winner = position.winner()
+            if winner == 'unknown':
+                return DRAW
+            if winner is not None:
+                return WIN if winner == position.player else LOSS
+        return self.get(canonical_key(position)[0])
+
+    def best_action(self, position):
+        """
+        Returns best known move or collapse of position.
+        Returns None when it is not sure the action is the best:
+        no following position is in database, or value of position
+        is not reached by known actions while some are missing.
+        """
+        best = None
+        best_value = None
+        missing = False
+        for action in actions(position):
+            child = position.copy()
+            apply(child, action)
+            value = self.value(child)
+            if value is None:
+                missing = True
+                continue
+            if child.player != position.player:
+                value = -value
+            if best_value is None or value > best_value:
+                best = action
+                best_value = value
+        if best is None or not missing or best_value == WIN:
+            return best
+        own = self.get(canonical_key(position)[0])
+        if own is not None and best_value >= own:
+            return best
+        return None
+
+    def close(self):
+        """
+        Releases mapped file
+        """
+        self._keys.release()
+        self._values.release()
+        self._map.close()
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Builds position database from solver checkpoints')
+    parser.add_argument('database', help='path of database file')
+    parser.add_argument('memos', nargs='+', help='solver checkpoint files')
+    args = parser.parse_args(argv)
+    values = {}
+    for path in args.memos:
+        values.update(load_memo(path))
+    write_database(args.database, values)
+    print(f'{len(values)} positions written to {args.database}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,538 @@
+from random import Random
+X = 0
+Y = 1
+PLAYERS = 'xy'
+
+LINES = ((0, 1, 2), (0, 3, 6), (0, 4, 8), (1, 4, 7),
+         (2, 5, 8), (3, 4, 5), (6, 7, 8), (2, 4, 6))
+TILE_LINES = tuple(tuple(index for index, line in enumerate(LINES) if tile in line)
+                   for tile in range(9))
+
+MOVE_CODES = 128
+_zobrist = Random(20210601)
+ZOBRIST_SPOOKY = tuple(tuple(_zobrist.getrandbits(64) for _ in range(MOVE_CODES))
+                       for _ in range(9))
+ZOBRIST_OWNER = tuple(tuple(_zobrist.getrandbits(64) for _ in range(MOVE_CODES))
+                      for _ in range(9))
+ZOBRIST_HALF = tuple(_zobrist.getrandbits(64) for _ in range(9))
+ZOBRIST_NUMBER = tuple(_zobrist.getrandbits(64) for _ in range(MOVE_CODES // 2))
+ZOBRIST_PLAYER = _zobrist.getrandbits(64)
+ZOBRIST_PENDING = _zobrist.getrandbits(64)
+
+
+def make_move(player, number):
+    """
+    Returns move code for player (X or Y) and round number
+    """
+    return (number << 1) | player
+
+
+def move_player(move):
+    """
+    Returns player (X or Y) who made move
+    """
+    return move & 1
+
+
+def move_number(move):
+    """
+    Returns round number of move
+    """
+    return move >> 1
+
+
+def parse_move(text):
+    """
+    Returns move code from string like 'x3'
+    """
+    return make_move(PLAYERS.index(text[0]), int(text[1:]))
+
+
+def format_move(move):
+    """
+    Returns string represent of move code, e.g. 'x3'
+    """
+    return f'{PLAYERS[move & 1]}{move >> 1}'
+
+
+def iter_bits(mask):
+    """
+    Yields numbers of set bits in mask from the lowest one
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BoardEngine:
+    """
+    Compact board state used by Board and Tile.
+    :param spooky: for every tile bitmask of move codes placed on it
+    :type spooky: list
+
+    :param owner: for every tile collapsed move code, -1 if not collapsed
+    :type owner: list
+
+    :param classical: for X and Y bitmask of tiles collapsed to them
+    :type classical: list
+
+    :param entangled: bitmask of tiles in entanglement
+    :type entangled: int
+
+    :param cycle: last move which closed a cycle of spooky marks, -1 if none
+    :type cycle: int
+
+    :param ends: for every spooky move tuple of not collapsed tiles with it
+    :type ends: dict
+
+    :param _parent: disjoint-set forest over tiles joined by spooky marks
+    :type _parent: list
+
+    :param _line_count: for X and Y number of collapsed tiles on every line
+    :type _line_count: list
+
+    :param _full: for X and Y bitmask of lines with all tiles collapsed to them
+    :type _full: list
+
+    :param zobrist: Zobrist hash of spooky marks and collapsed moves,
+        updated with every change
+    :type zobrist: int
+
+    :param _result: cached result of the game, None when it must be computed
+    :type _result: tuple
+
+    :param _options: entangled mask and dict of collapse options with their
+        previews, None when they must be computed
+    :type _options: tuple
+    """
+    __slots__ = ('spooky', 'owner', 'classical', 'entangled', 'cycle', 'ends', 'zobrist',
+                 '_parent', '_dirty', '_line_count', '_full', '_collapsed',
+                 '_result', '_options')
+
+    def __init__(self):
+        self.spooky = [0] * 9
+        self.owner = [-1] * 9
+        self.classical = [0, 0]
+        self.entangled = 0
+        self.cycle = -1
+        self.ends = {}
+        self.zobrist = 0
+        self._parent = list(range(9))
+        self._dirty = False
+        self._line_count = [[0] * 8, [0] * 8]
+        self._full = [0, 0]
+        self._collapsed = 0
+        self._result = None
+        self._options = None
+
+    @classmethod
+    def from_marks(cls, spooky, owner, entangled=0, cycle=-1):
+        """
+        Returns engine built from spooky masks and collapsed moves of tiles
+        """
+        engine = cls()
+        for tile, move in enumerate(owner):
+            if move >= 0:
+                engine.set_collapsed(tile, move)
+        marks = {}
+        for tile, mask in enumerate(spooky):
+            for move in iter_bits(mask):
+                marks.setdefault(move, []).append(tile)
+        for move in sorted(marks):
+            for tile in marks[move]:
+                engine.place(tile, move)
+        engine.entangled = entangled
+        engine.cycle = cycle
+        return engine
+
+    def copy(self):
+        """
+        Returns independent copy of engine
+        """
+        other = BoardEngine.__new__(BoardEngine)
+        other.load(self)
+        return other
+
+    def load(self, other):
+        """
+        Makes engine independent copy of other engine
+        """
+        self.spooky = other.spooky[:]
+        self.owner = other.owner[:]
+        self.classical = other.classical[:]
+        self.entangled = other.entangled
+        self.cycle = other.cycle
+        self.ends = other.ends.copy()
+        self.zobrist = other.zobrist
+        self._parent = other._parent[:]
+        self._dirty = other._dirty
+        self._line_count = [other._line_count[X][:], other._line_count[Y][:]]
+        self._full = other._full[:]
+        self._collapsed = other._collapsed
+        self._result = other._result
+        self._options = other._options
+
+    def line_count(self, player):
+        """
+        Returns list with number of tiles collapsed to player on every line
+        """
+        return self._line_count[player]
+
+    def tiles_with(self, move):
+        """
+        Returns tuple of not collapsed tiles with spooky move
+        """
+        return self.ends.get(move, ())
+
+    def has_move(self, tile, move):
+        """
+        Returns true if move is spooky mark on tile
+        """
+        return bool(self.spooky[tile] >> move & 1)
+
+    def moves(self, tile):
+        """
+        Returns list of move codes on tile,
+        collapsed tile returns its move three times
+        """
+        owner = self.owner[tile]
+        if owner >= 0:
+            return [owner, owner, owner]
+        return list(iter_bits(self.spooky[tile]))
+
+    def is_collapsed(self, tile):
+        """
+        Returns true if tile is collapsed
+        """
+        return self.owner[tile] >= 0
+
+    def is_entangled(self, tile):
+        """
+        Returns true if tile is in entanglement
+        """
+        return bool(self.entangled >> tile & 1)
+
+    def set_entangled(self, tile, entanglement):
+        """
+        Sets or clears tile entanglement flag
+        """
+        if entanglement:
+            self.entangled |= 1 << tile
+        else:
+            self.entangled &= ~(1 << tile)
+
+    def place(self, tile, move):
+        """
+        Places spooky mark on tile.
+        When it is second half of move joins both tiles
+        and remembers move if it closed a cycle.
+        """
+        bit = 1 << move
+        if self.spooky[tile] & bit:
+            return
+        if self._dirty:
+            self._rebuild()
+        ends = self.ends.get(move, ())
+        if ends:
+            self._union(tile, ends[0], move)
+        self.ends[move] = ends + (tile,)
+        self.spooky[tile] |= bit
+        self.zobrist ^= ZOBRIST_SPOOKY[tile][move]
+        self._options = None
+
+    def remove(self, tile, move):
+        """
+        Removes move from tile, collapsed tile with this move is released
+        """
+        if self.spooky[tile] >> move & 1:
+            self._drop_end(tile, move)
+            self.zobrist ^= ZOBRIST_SPOOKY[tile][move]
+        self.spooky[tile] &= ~(1 << move)
+        if self.owner[tile] == move:
+            self._set_owner(tile, -1)
+        self._dirty = True
+        self._options = None
+
+    def set_collapsed(self, tile, move):
+        """
+        Makes tile classical with move
+        """
+        self._drop_tile(tile)
+        self._set_owner(tile, move)
+        self._dirty = True
+
+    def clear(self, tile):
+        """
+        Returns tile to default state
+        """
+        self._drop_tile(tile)
+        self._set_owner(tile, -1)
+        self.set_entangled(tile, False)
+        self._dirty = True
+
+    def collapse(self, tile, move):
+        """
+        Collapses move on tile and goes through spooky marks of every
+        collapsed tile to the other tile of the mark.
+        Returns list of (tile, move) of tiles which became classical
+        """
+        changed = []
+        queue = [(tile, move)]
+        for tile, move in queue:
+            if self.owner[tile] >= 0:
+                continue
+            others = self.spooky[tile] & ~(1 << move)
+            self.set_collapsed(tile, move)
+            changed.append((tile, move))
+            for other_move in iter_bits(others):
+                for other in self.ends.get(other_move, ()):
+                    queue.append((other, other_move))
+        return changed
+
+    def collapse_options(self):
+        """
+        Returns list of (tile, move) which could be collapsed: move on
+        tile of the cycle which is also on other tile of the cycle.
+        Tiles hanging off the cycle collapse with it, so they give no options.
+        Entangled tiles set by hand without a cycle are taken as they are.
+        Options are kept until marks or entangled tiles change.
+        """
+        return list(self._collapse_options())
+
+    def is_collapse_option(self, tile, move):
+        """
+        Returns true if move on tile could be collapsed
+        """
+        return (tile, move) in self._collapse_options()
+
+    def collapse_preview(self, tile, move):
+        """
+        Returns list of collapsed moves of every tile after collapse
+        of move on tile, engine is not changed
+        """
+        options = self._collapse_options()
+        preview = options.get((tile, move))
+        if preview is None:
+            owner = self.owner[:]
+            queue = [(tile, move)]
+            for queued, queued_move in queue:
+                if owner[queued] >= 0:
+                    continue
+                owner[queued] = queued_move
+                for other_move in iter_bits(self.spooky[queued] & ~(1 << queued_move)):
+                    for other in self.ends.get(other_move, ()):
+                        queue.append((other, other_move))
+            preview = tuple(owner)
+            if (tile, move) in options:
+                options[(tile, move)] = preview
+        return list(preview)
+
+    def _collapse_options(self):
+        entangled = self.entangled
+        if self._options is None or self._options[0] != entangled:
+            options = {}
+            cycle = self.cycle_tiles(entangled) or entangled
+            for tile in iter_bits(cycle):
+                for move in iter_bits(self.spooky[tile]):
+                    for other in self.ends[move]:
+                        if other != tile and cycle >> other & 1:
+                            options[(tile, move)] = None
+                            break
+            self._options = (entangled, options)
+        return self._options[1]
+
+    def cycle_tiles(self, component):
+        """
+        Returns bitmask of tiles of component which lie on a cycle
+        of spooky marks, tiles hanging off the cycle are dropped
+        """
+        cycle = component
+        while True:
+            leaves = 0
+            for tile in iter_bits(cycle):
+                degree = 0
+                for move in iter_bits(self.spooky[tile]):
+                    for other in self.ends[move]:
+                        if other != tile and cycle >> other & 1:
+                            degree += 1
+                if degree < 2:
+                    leaves |= 1 << tile
+            if not leaves:
+                return cycle
+            cycle &= ~leaves
+
+    def save(self, mask, move=-1):
+        """
+        Returns delta with marks of tiles in mask, ends of their moves
+        and of move placed after save, which restore brings back
+        """
+        tiles = []
+        moves = {move} if move >= 0 else set()
+        for tile in iter_bits(mask):
+            tiles.append((tile, self.spooky[tile], self.owner[tile]))
+            moves.update(iter_bits(self.spooky[tile]))
+        ends = [(move, self.ends.get(move)) for move in moves]
+        return (tiles, ends, self._parent[:], self._dirty, self.cycle, self.entangled)
+
+    def restore(self, delta):
+        """
+        Brings back state saved by save, changes after save
+        must touch only saved tiles
+        """
+        tiles, ends, parent, dirty, cycle, entangled = delta
+        for tile, spooky, owner in tiles:
+            if self.owner[tile] != owner:
+                self._set_owner(tile, owner)
+            for move in iter_bits(self.spooky[tile] ^ spooky):
+                self.zobrist ^= ZOBRIST_SPOOKY[tile][move]
+            self.spooky[tile] = spooky
+        for move, holders in ends:
+            if holders is None:
+                self.ends.pop(move, None)
+            else:
+                self.ends[move] = holders
+        self._parent = parent
+        self._dirty = dirty
+        self.cycle = cycle
+        self.entangled = entangled
+        self._options = None
+
+    def _drop_end(self, tile, move):
+        ends = tuple(end for end in self.ends[move] if end != tile)
+        if ends:
+            self.ends[move] = ends
+        else:
+            del self.ends[move]
+
+    def _drop_tile(self, tile):
+        for move in iter_bits(self.spooky[tile]):
+            self._drop_end(tile, move)
+            self.zobrist ^= ZOBRIST_SPOOKY[tile][move]
+        self.spooky[tile] = 0
+
+    def _find(self, tile):
+        parent = self._parent
+        while parent[tile] != tile:
+            parent[tile] = parent[parent[tile]]
+            tile = parent[tile]
+        return tile
+
+    def _union(self, tile, other, move):
+        root, other_root = self._find(tile), self._find(other)
+        if root == other_root:
+            self.cycle = move
+        else:
+            self._parent[root] = other_root
+
+    def _rebuild(self):
+        """
+        Builds disjoint sets again after marks were removed from tiles
+        """
+        self._parent = list(range(9))
+        self.cycle = -1
+        self._dirty = False
+        for ends in self.ends.values():
+            if len(ends) == 2:
+                root, other_root = self._find(ends[0]), self._find(ends[1])
+                if root != other_root:
+                    self._parent[root] = other_root
+
+    def cycle_component(self, move):
+        """
+        Returns bitmask of not collapsed tiles connected with cycle
+        closed by move, 0 if move did not close a cycle
+        """
+        if self._dirty:
+            self._rebuild()
+        if move != self.cycle or move not in self.ends:
+            return 0
+        root = self._find(self.ends[move][0])
+        component = 0
+        for tile in range(9):
+            if self.owner[tile] < 0 and self._find(tile) == root:
+                component |= 1 << tile
+        return component
+
+    def _set_owner(self, tile, move):
+        """
+        Changes collapsed move of tile and updates line counters
+        of lines going through it
+        """
+        bit = 1 << tile
+        old = self.owner[tile]
+        if old >= 0:
+            self.zobrist ^= ZOBRIST_OWNER[tile][old]
+            player = old & 1
+            counts = self._line_count[player]
+            self.classical[player] &= ~bit
+            for line in TILE_LINES[tile]:
+                if counts[line] == 3:
+                    self._full[player] &= ~(1 << line)
+                counts[line] -= 1
+            self._collapsed -= 1
+        if move >= 0:
+            self.zobrist ^= ZOBRIST_OWNER[tile][move]
+            player = move & 1
+            counts = self._line_count[player]
+            self.classical[player] |= bit
+            for line in TILE_LINES[tile]:
+                counts[line] += 1
+                if counts[line] == 3:
+                    self._full[player] |= 1 << line
+            self._collapsed += 1
+        self.owner[tile] = move
+        self._result = None
+        self._options = None
+
+    def not_collapsed(self):
+        """
+        Returns number of tiles which are not collapsed
+        """
+        return 9 - self._collapsed
+
+    def winning_lines(self):
+        """
+        Returns list of (player, line, subscript) for every completed line.
+        Subscript is the lowest round number on the line.
+        """
+        lines = []
+        owner = self.owner
+        for index in iter_bits(self._full[X] | self._full[Y]):
+            line = LINES[index]
+            player = X if self._full[X] >> index & 1 else Y
+            subscript = min(owner[line[0]], owner[line[1]], owner[line[2]]) >> 1
+            lines.append((player, line, subscript))
+        return lines
+
+    def result(self):
+        """
+        Returns (player, line, subscript) of the winner, player is X, Y,
+        'unknown' for draw or None when game is not finished.
+        Result is kept until next change of collapsed tiles.
+        """
+        if self._result is None:
+            best = None
+            for player, line, subscript in self.winning_lines():
+                if best is None or subscript <= best[2]:
+                    best = (player, list(line), subscript)
+            if best is None:
+                if self._collapsed >= 8:
+                    best = ('unknown', [], None)
+                else:
+                    best = (None, [], None)
+            self._result = best
+        return self._result
+
+    def clear_result(self):
+        """
+        Forgets cached result, next result call computes it again
+        """
+        self._result = None
+
+    def winner(self):
+        """
+        Returns (player, line) of the winner, player is X, Y,
+        'unknown' for draw or None when game is not finished
+        """
+        return self.result()[:2]
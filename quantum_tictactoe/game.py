@@ -1,6 +1,11 @@
 from quantum_tictactoe.bot import Bot, BotTypeError
 from quantum_tictactoe.tile import Tile
 from quantum_tictactoe.board import Board, InvalidCollapseError
+from quantum_tictactoe.engine import X, Y, PLAYERS, make_move, move_player, parse_move
+from quantum_tictactoe.engine import ZOBRIST_NUMBER, ZOBRIST_PLAYER, ZOBRIST_HALF, ZOBRIST_PENDING
+from quantum_tictactoe.tracer import Tracer, span
+from quantum_tictactoe.tracer import FIRST_HALF, SECOND_HALF, BOT_MOVE, ENTANGLEMENT, COLLAPSE, WIN_CHECK
+import os
 import sys
 
 
@@ -26,8 +31,8 @@ class Game:
     :param _last_tile: number of last used tile
     :type last_tile: int default ''
 
-    :param _last_move: last move on board
-    :type _last_move: str
+    :param _last_move: last move code on board, None before first move
+    :type _last_move: int
 
     :param _finished: contains info if game is finished, default to false
     :type _finished: boolean
@@ -37,17 +42,26 @@ class Game:
 
     :param _counter: contains round number, default to 1
     :type _counter: int
+
+    :param _undo: stack of game state and board delta of every made
+        move and collapse, unmake takes them back
+    :type _undo: list
+
+    :param tracer: Tracer which gets spans of turn phases in play, default to None
+    :type tracer: Tracer
     """
-    def __init__(self, board):
+    def __init__(self, board, tracer=None):
         self.board = board
+        self.tracer = tracer
         self.entanglement = False
         self.basic = True
         self._first_move = True
         self._last_tile = ''
-        self._last_move = ''
+        self._last_move = None
         self._finished = False
         self._game_result = ''
         self._counter = 1
+        self._undo = []
 
     def is_first_move(self):
         """
@@ -86,6 +100,14 @@ class Game:
         """
         self._last_move = last
 
+    def last_player(self):
+        """
+        Returns player (X or Y) who made last move, None before first move
+        """
+        if self._last_move is None:
+            return None
+        return move_player(self._last_move)
+
     def is_finished(self):
         """
         Returns true if game is finished, other false
@@ -124,10 +146,11 @@ class Game:
         self.basic = True
         self._first_move = True
         self._last_tile = ''
-        self._last_move = ''
+        self._last_move = None
         self._finished = False
         self._game_result = ''
         self._counter = 1
+        self._undo = []
         for tile in self.board.tiles():
             tile.clear_tile()
 
@@ -146,10 +169,10 @@ class Game:
         """
         Returns move to opposite site and add number of round to player move.
         """
-        if 'x' in self._last_move:
-            return f'y{int(self._counter)}'
+        if self.last_player() == X:
+            return make_move(Y, self._counter)
         else:
-            return f'x{int(self._counter)}'
+            return make_move(X, self._counter)
 
     def move(self, new_move):
         """
@@ -166,34 +189,17 @@ class Game:
         self._last_tile = new_move
         return new_move
 
-    def rec_entanglement(self, tile_move, last_move):
-        """
-        If board is in entanglement changes game state.
-        """
-        for index, tile in enumerate(self.board.tiles()):
-            if last_move in tile.array() and index != tile_move:
-                if index == self._last_tile:
-                    self.board.add_entangl_tile(index)
-                    self.entanglement = True
-                    self.basic = False
-                    break
-                for move in tile.array():
-                    if move != last_move:
-                        self.board.add_entangl_tile(index)
-                        self.rec_entanglement(index, move)
-
     def is_entanglement(self):
         """
         Checks entanglement and returns True if game is in entanglement.
         """
-        for index, tile in enumerate(self.board.tiles()):
-            if index != self._last_tile and self._last_move in tile.array():
-                for move in tile.array():
-                    if move != self._last_move:
-                        self.board.add_entangl_tile(index)
-                        self.rec_entanglement(index, move)
-                        if self.entanglement is True:
-                            return True
+        component = []
+        if self._last_move is not None:
+            component = self.board.cycle_component(self._last_move)
+        if component:
+            for index in component:
+                self.board.add_entangl_tile(index)
+            return True
         self.board.reset_entangl_tiles()
         return False
 
@@ -210,16 +216,26 @@ class Game:
 
     def game_collapse(self, bot, bot_mode, collapse=''):
         """
-        Needs info with tile and move to collapse, split answer,
-        collapse board and sets state of the game
+        Needs info with tile and move to collapse as tuple
+        or string 'tile_number,move' from player, split answer,
+        collapse board and sets state of the game.
+        Returns list of (tile, move) of tiles which became collapsed
         """
-        who_choose = 'X' if 'y' in self._last_move else 'Y'
+        who_choose = 'X' if self.last_player() == Y else 'Y'
         if bot_mode != 'none' and who_choose == 'Y':
             collapse = bot.collapse()
-        tile_number, what_collapse = collapse.split(',')
-        self.board.collapse(int(tile_number), what_collapse)
+        if isinstance(collapse, str):
+            try:
+                tile_number, what_collapse = collapse.split(',')
+                collapse = int(tile_number), parse_move(what_collapse.strip())
+            except (ValueError, IndexError):
+                raise InvalidCollapseError("""Cannot collapse it.
+Write tile number and move, e.g. 1,x1""")
+        tile_number, what_collapse = collapse
+        changed = self.board.collapse(tile_number, what_collapse)
         self.entanglement = False
         self.basic = True
+        return changed
 
     def is_game_end(self):
         """
@@ -245,6 +261,134 @@ class Game:
             self._finished = False
             return False
 
+    def load(self, position, last_tile=''):
+        """
+        Sets board and game state from Position.
+        last_tile is second tile of last move when its first half is not placed
+        """
+        self.board.engine().load(position.engine)
+        self.entanglement = position.pending >= 0
+        self.basic = not self.entanglement
+        self._first_move = position.half < 0
+        self._last_tile = last_tile if position.half < 0 else position.half
+        if position.number > 1:
+            self._last_move = make_move(position.player ^ 1, position.number - 1)
+        else:
+            self._last_move = None
+        self._counter = position.number
+        self._undo = []
+        self._finished = False
+        self._game_result = ''
+        if not self.entanglement:
+            self.is_game_end()
+
+    def key(self):
+        """
+        Returns Zobrist hash of game state, the same as key of its Position.
+        Marks are hashed by the board with every change.
+        """
+        key = self.board.engine().zobrist ^ ZOBRIST_NUMBER[self._counter]
+        if move_player(self.whos_move()) != X:
+            key ^= ZOBRIST_PLAYER
+        if not self._first_move:
+            key ^= ZOBRIST_HALF[self._last_tile]
+        if self.entanglement:
+            key ^= ZOBRIST_PENDING
+        return key
+
+    def legal_moves(self):
+        """
+        Yields (first, second) tiles of every legal move without changing
+        the board. When first half is placed first is the last tile.
+        Yields nothing in entanglement or after end of the game.
+        """
+        if self.entanglement or self._finished:
+            return
+        free = [index for index, tile in enumerate(self.board.tiles())
+                if not tile.is_collapsed()]
+        if not self._first_move:
+            for tile in free:
+                if tile != self._last_tile:
+                    yield self._last_tile, tile
+            return
+        for index, first in enumerate(free):
+            for second in free[index + 1:]:
+                yield first, second
+
+    def collapse_options(self):
+        """
+        Yields (tile, move) of every valid collapse without changing the board
+        """
+        if not self.entanglement:
+            return
+        for option in self.board.collapse_options():
+            yield option
+
+    def _state(self):
+        return (self.entanglement, self.basic, self._first_move, self._last_tile,
+                self._last_move, self._finished, self._game_result, self._counter)
+
+    def make_move(self, first, second):
+        """
+        Places both halves of move, or only second one when first half
+        is already placed on first, and checks entanglement.
+        Move is saved on undo stack.
+        Returns True if move closed a cycle
+        """
+        if self.entanglement or self._finished:
+            raise InvalidMoveError('You cannot move now')
+        if not self._first_move and first != self._last_tile:
+            raise InvalidMoveError('First half of move is on another tile')
+        for tile in (first, second):
+            if tile not in range(0, 9):
+                raise InvalidMoveError('Tiles are numbering from 0 to 8')
+            if self.board.tiles()[tile].is_collapsed():
+                raise InvalidMoveError('You cannot place your move here')
+        if first == second:
+            raise InvalidMoveError('You cannot place your move here')
+        move = self.whos_move()
+        tiles = [second] if not self._first_move else [first, second]
+        mask = 0
+        for tile in tiles:
+            mask |= 1 << tile
+        delta = self.board.engine().save(mask, move)
+        self._undo.append((self._state(), delta))
+        for tile in tiles:
+            self.board.tiles()[tile].set_move_on_tile(move)
+        self._last_tile = second
+        self._last_move = move
+        self._counter += 1
+        self._first_move = True
+        self.game_entanglement()
+        return self.entanglement
+
+    def make_collapse(self, tile, move):
+        """
+        Collapses move on tile and checks end of the game.
+        Collapse is saved on undo stack.
+        Returns list of (tile, move) of tiles which became collapsed
+        """
+        if not self.entanglement:
+            raise InvalidCollapseError('Nothing to collapse')
+        engine = self.board.engine()
+        delta = engine.save(engine.entangled)
+        changed = self.board.collapse(tile, move)
+        self._undo.append((self._state(), delta))
+        self.entanglement = False
+        self.basic = True
+        self.board.reset_entangl_tiles()
+        self.is_game_end()
+        return changed
+
+    def unmake(self):
+        """
+        Takes back last move or collapse made with make_move or make_collapse
+        """
+        state, delta = self._undo.pop()
+        self.board.engine().restore(delta)
+        (self.entanglement, self.basic, self._first_move, self._last_tile,
+         self._last_move, self._finished, self._game_result, self._counter) = state
+
     def play(self):
         """
         Main loop of the game in terminal version
@@ -252,52 +396,63 @@ class Game:
         bot_selected = False
         while not bot_selected:
             try:
-                bot_mode = input('Choose bot mode (none/easy/hard): ')
+                bot_mode = input('Choose bot mode (none/easy/hard/mcts): ')
                 bot = Bot(bot_mode, self.board, self)
                 bot_selected = True
             except BotTypeError as err:
                 print(err)
-        while not self._finished:
-            while self.basic:
-                try:
-                    if bot_mode != 'none' and 'x' in self._last_move:
-                        self._last_tile = bot.move()[1]
-                        self._last_move = self.whos_move()
-                        self._counter += 1
-                        self.game_entanglement()
-                    else:
-                        if self._first_move:
-                            print(self.board.show_board())
-                            new_move = int(input(f'Your move {self.whos_move()[0]}: '))
-                            self.move(new_move)
-                            self._first_move = False
-                        else:
-                            print(self.board.show_board())
-                            new_move = int(input(f'Your move {self.whos_move()[0]}: '))
-                            self.move(new_move)
+        try:
+            while not self._finished:
+                while self.basic:
+                    try:
+                        if bot_mode != 'none' and self.last_player() == X:
+                            with span(self.tracer, BOT_MOVE, turn=self._counter):
+                                self._last_tile = bot.move()[1]
                             self._last_move = self.whos_move()
                             self._counter += 1
-                            self._first_move = True
-                            self.game_entanglement()
-                except InvalidMoveError as err:
-                    print(err)
-                except ValueError:
-                    print("Don't use letters. Use digits from 0 to 8.")
-            if self.entanglement:
-                try:
-                    print(self.board.show_board())
-                    who_choose = 'X' if 'y' in self._last_move else 'Y'
-                    if bot_mode == 'none' or who_choose == 'X':
-                        description = f'Player {who_choose} choose'
-                        description += ' what will collapse(tile_number,what_collapse): '
-                        collapse = input(description)
-                        self.game_collapse(bot, bot_mode, collapse)
-                    else:
-                        self.game_collapse(bot, bot_mode)
-                    self.board.reset_entangl_tiles()
-                except InvalidCollapseError as err:
-                    print(err)
-            self.is_game_end()
+                            with span(self.tracer, ENTANGLEMENT, turn=self._counter - 1):
+                                self.game_entanglement()
+                        else:
+                            if self._first_move:
+                                print(self.board.show_board())
+                                new_move = int(input(f'Your move {PLAYERS[move_player(self.whos_move())]}: '))
+                                with span(self.tracer, FIRST_HALF, turn=self._counter):
+                                    self.move(new_move)
+                                self._first_move = False
+                            else:
+                                print(self.board.show_board())
+                                new_move = int(input(f'Your move {PLAYERS[move_player(self.whos_move())]}: '))
+                                with span(self.tracer, SECOND_HALF, turn=self._counter):
+                                    self.move(new_move)
+                                self._last_move = self.whos_move()
+                                self._counter += 1
+                                self._first_move = True
+                                with span(self.tracer, ENTANGLEMENT, turn=self._counter - 1):
+                                    self.game_entanglement()
+                    except InvalidMoveError as err:
+                        print(err)
+                    except ValueError:
+                        print("Don't use letters. Use digits from 0 to 8.")
+                if self.entanglement:
+                    try:
+                        print(self.board.show_board())
+                        who_choose = 'X' if self.last_player() == Y else 'Y'
+                        if bot_mode == 'none' or who_choose == 'X':
+                            description = f'Player {who_choose} choose'
+                            description += ' what will collapse(tile_number,what_collapse): '
+                            collapse = input(description)
+                            with span(self.tracer, COLLAPSE, turn=self._counter - 1):
+                                self.game_collapse(bot, bot_mode, collapse)
+                        else:
+                            with span(self.tracer, COLLAPSE, turn=self._counter - 1):
+                                self.game_collapse(bot, bot_mode)
+                        self.board.reset_entangl_tiles()
+                    except InvalidCollapseError as err:
+                        print(err)
+                with span(self.tracer, WIN_CHECK, turn=self._counter - 1):
+                    self.is_game_end()
+        finally:
+            bot.close()
         print(self.board.show_board())
         print(self._game_result)
 
@@ -307,8 +462,13 @@ def main():
     for i in range(0, 9):
         tiles.append(Tile())
     myboard = Board(tiles)
-    game = Game(myboard)
-    game.play()
+    trace_path = os.environ.get('QTTT_TRACE')
+    game = Game(myboard, Tracer() if trace_path else None)
+    try:
+        game.play()
+    finally:
+        if trace_path:
+            game.tracer.write(trace_path)
 
 
 if __name__ == '__main__':
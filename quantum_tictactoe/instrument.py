@@ -0,0 +1,105 @@
+from functools import wraps
+from time import perf_counter
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.bot import Bot
+from quantum_tictactoe.engine import BoardEngine
+from quantum_tictactoe.game import Game
+
+TARGETS = (
+    (Game, 'is_entanglement'),
+    (Game, 'game_collapse'),
+    (Game, 'is_game_end'),
+    (Board, 'cycle_component'),
+    (Board, 'collapse'),
+    (Board, 'is_winner'),
+    (BoardEngine, 'collapse'),
+    (BoardEngine, 'result'),
+    (Bot, 'move'),
+    (Bot, 'choose_move'),
+    (Bot, 'collapse'),
+)
+
+_originals = {}
+_stats = {}
+
+
+def _name(cls, method):
+    return f'{cls.__name__}.{method}'
+
+
+def _wrap(name, function):
+    stats = _stats[name]
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        stats['depth'] += 1
+        if stats['depth'] > stats['max_depth']:
+            stats['max_depth'] = stats['depth']
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats['seconds'] += perf_counter() - start
+            stats['calls'] += 1
+            stats['depth'] -= 1
+    return wrapper
+
+
+def enable(targets=TARGETS):
+    """
+    Installs counting wrappers on methods in targets, list of (class, method).
+    Methods are not changed until enable is called.
+    """
+    for cls, method in targets:
+        name = _name(cls, method)
+        if name in _originals:
+            continue
+        _stats.setdefault(name, {'calls': 0, 'seconds': 0.0, 'depth': 0, 'max_depth': 0})
+        function = cls.__dict__[method]
+        _originals[name] = (cls, method, function)
+        setattr(cls, method, _wrap(name, function))
+
+
+def disable():
+    """
+    Puts original methods back, counters are kept
+    """
+    for cls, method, function in _originals.values():
+        setattr(cls, method, function)
+    _originals.clear()
+
+
+def is_enabled():
+    """
+    Returns true if wrappers are installed
+    """
+    return bool(_originals)
+
+
+def reset():
+    """
+    Clears counters
+    """
+    for stats in _stats.values():
+        stats.update(calls=0, seconds=0.0, max_depth=stats['depth'])
+
+
+def snapshot():
+    """
+    Returns dict of method name and its calls, cumulative seconds
+    and maximal depth of nested calls
+    """
+    return {name: {'calls': stats['calls'], 'seconds': stats['seconds'],
+                   'max_depth': stats['max_depth']}
+            for name, stats in _stats.items() if stats['calls']}
+
+
+def merge_snapshot(snapshot, other):
+    """
+    Adds other snapshot to snapshot
+    """
+    for name, stats in other.items():
+        total = snapshot.setdefault(name, {'calls': 0, 'seconds': 0.0, 'max_depth': 0})
+        total['calls'] += stats['calls']
+        total['seconds'] += stats['seconds']
+        total['max_depth'] = max(total['max_depth'], stats['max_depth'])
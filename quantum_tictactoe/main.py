@@ -1,26 +1,35 @@
 from quantum_tictactoe.form import Ui_main
 from quantum_tictactoe.game import InvalidMoveError, InvalidCollapseError, BotTypeError
 from quantum_tictactoe.game import Tile, Bot, Board, Game
+from quantum_tictactoe.engine import X, Y, format_move
+from quantum_tictactoe.tracer import Tracer, span
+from quantum_tictactoe.tracer import FIRST_HALF, SECOND_HALF, BOT_MOVE, ENTANGLEMENT, COLLAPSE, WIN_CHECK
 from PyQt5 import QtCore, QtGui, QtWidgets
 from functools import partial
+import os
 import sys
 
+WIN_STYLE = "background-color: rgb(220,20,60);\nfont: 10pt \"MS Shell Dlg 2\";"
+COLLAPSED_STYLE = "background-color: rgb(32,178,170);\nfont: 10pt \"MS Shell Dlg 2\";"
+OPEN_STYLE = "background-color: rgb(0, 85, 255);\ncolor: rgb(255, 255, 255);\nfont: 10pt \"MS Shell Dlg 2\";"
+
 
 class Ui_main_my(Ui_main):
-    def __init__(self, main):
+    def __init__(self, main, tracer=None):
         super().__init__()
         super().setupUi(main)
         tiles = []
         for _ in range(9):
             tiles.append(Tile())
         self.myboard = Board(tiles)
-        self.game = Game(self.myboard)
+        self.game = Game(self.myboard, tracer)
         self.bot_mode = ''
         self.last_clicked = None
         self.info.setText('Choose mode on top bar. If you are in game, choosing mode will clear board and start new game')
         self.buttons = [self.Button1_1, self.Button1_2, self.Button1_3,
                         self.Button2_1, self.Button2_2, self.Button2_3,
                         self.Button3_1, self.Button3_2, self.Button3_3]
+        self.styles = [None] * len(self.buttons)
         self.coll_buttons = [self.collButton1, self.collButton2, self.collButton3,
                              self.collButton4, self.collButton5, self.collButton6,
                              self.collButton7, self.collButton8, self.collButton9,
@@ -44,11 +53,11 @@ class Ui_main_my(Ui_main):
                 self.place_move(button)
             except InvalidMoveError as err:
                 self.info.setText(str(err))
-        if self.bot_mode != 'none' and 'x' in self.game.last_move():
+        if self.bot_mode != 'none' and self.game.last_player() == X:
             self.bot_move()
         if self.game.entanglement:
             self.clear_coll_buttons()
-            player = 'X' if 'y' in self.game.last_move() else 'Y'
+            player = 'X' if self.game.last_player() == Y else 'Y'
             mess = f'Game is in entanglement. Player {player} must choose which move will collapse.'
             self.info.setText(mess)
             self.makes_buttons_entangl()
@@ -67,32 +76,36 @@ class Ui_main_my(Ui_main):
 
     def show_collapsion(self, button):
         """
-        Show moves which are in button on coll_buttons
+        Show moves of button which could collapse on coll_buttons
         """
-        button_text = button.text()
-        button_text = button_text.replace('\n', ', ')
-        moves = button_text.split(', ')
-        for index, move in enumerate(moves):
-            if '*' in move:
-                move = move[:-1]
-            if 'x' in move or 'y' in move:
-                self.coll_buttons[index].setVisible(True)
-                self.coll_buttons[index].setEnabled(True)
-                self.coll_buttons[index].setText(str(move))
+        index = self.buttons.index(button)
+        moves = [move for tile, move in self.game.board.collapse_options() if tile == index]
+        for coll_button, move in zip(self.coll_buttons, moves):
+            coll_button.setVisible(True)
+            coll_button.setEnabled(True)
+            coll_button.setText(format_move(move))
 
     def bot_move(self):
         """
         Checks game state and run right bot script
         """
+        tracer = self.game.tracer
+        turn = self.game.counter()
         if self.game.entanglement:
-            self.game.game_collapse(self.bot, self.bot_mode)
-            self.refresh_buttons_text()
+            dirty = set(self.game.board.entangl_tiles())
+            with span(tracer, COLLAPSE, turn=turn - 1):
+                changed = self.game.game_collapse(self.bot, self.bot_mode)
+            dirty.update(tile for tile, _ in changed)
+            self.refresh_buttons_text(dirty)
             self.game.board.reset_entangl_tiles()
-        if self.game.is_game_end():
+        with span(tracer, WIN_CHECK, turn=turn - 1):
+            finished = self.game.is_game_end()
+        if finished:
             self.info.setText(str(self.game.game_result()))
-            self.refresh_buttons_text()
+            self.refresh_buttons_text(())
         elif self.game.basic:
-            moves = self.bot.move()
+            with span(tracer, BOT_MOVE, turn=turn):
+                moves = self.bot.move()
             move = self.game.whos_move()
             for tile in moves:
                 text = self.buttons[tile].text()
@@ -101,7 +114,8 @@ class Ui_main_my(Ui_main):
             self.game.set_last_tile(moves[1])
             self.game.set_last_move(move)
             self.game.increase_counter()
-            self.game.game_entanglement()
+            with span(tracer, ENTANGLEMENT, turn=turn):
+                self.game.game_entanglement()
             self.info.setText('Your turn X')
 
     def place_move(self, button):
@@ -109,27 +123,33 @@ class Ui_main_my(Ui_main):
         Appends move to tile/button
         Change game state
         """
+        tracer = self.game.tracer
+        turn = self.game.counter()
         text = button.text()
         move = self.game.whos_move()
         text = self.add_move_to_text(text, move)
         for index, butt in enumerate(self.buttons):
             if butt == button:
                 if self.game.is_first_move():
-                    self.game.move(index)
+                    with span(tracer, FIRST_HALF, turn=turn):
+                        self.game.move(index)
                     self.game.set_first_move(False)
                 else:
-                    self.game.move(index)
+                    with span(tracer, SECOND_HALF, turn=turn):
+                        self.game.move(index)
                     self.game.set_last_move(move)
                     self.game.increase_counter()
                     self.game.set_first_move(True)
                     self.whos_turn()
-                    self.game.game_entanglement()
+                    with span(tracer, ENTANGLEMENT, turn=turn):
+                        self.game.game_entanglement()
         button.setText(text)
 
     def add_move_to_text(self, text, move):
         """
         Appends move to text and returns text
         """
+        move = format_move(move)
         if text == '':
             text += move
         elif len(text) == 14:
@@ -152,17 +172,24 @@ class Ui_main_my(Ui_main):
         """
         Collapses move which is on clicked button
         """
+        tracer = self.game.tracer
+        turn = self.game.counter() - 1
         try:
             collapse = self.to_collapse(button)
-            if 'x' not in self.game.last_move() or self.bot_mode == 'none':
-                self.game.game_collapse(self.bot, self.bot_mode, collapse)
-            self.refresh_buttons_text()
+            dirty = set(self.game.board.entangl_tiles())
+            if self.game.last_player() != X or self.bot_mode == 'none':
+                with span(tracer, COLLAPSE, turn=turn):
+                    changed = self.game.game_collapse(self.bot, self.bot_mode, collapse)
+                dirty.update(tile for tile, _ in changed)
+            self.refresh_buttons_text(dirty)
             self.game.board.reset_entangl_tiles()
             self.clear_coll_buttons()
-            if self.game.is_game_end():
+            with span(tracer, WIN_CHECK, turn=turn):
+                finished = self.game.is_game_end()
+            if finished:
                 self.game.set_finished()
                 self.info.setText(str(self.game.game_result()))
-                self.refresh_buttons_text()
+                self.refresh_buttons_text(())
             else:
                 self.whos_turn()
         except InvalidCollapseError as err:
@@ -172,39 +199,48 @@ class Ui_main_my(Ui_main):
         """
         Sets info about which player can move now on self.info
         """
-        player = 'X' if 'y' in self.game.last_move() else 'Y'
+        player = 'X' if self.game.last_player() == Y else 'Y'
         text = f'Your turn {player}'
         self.info.setText(text)
 
-    def refresh_buttons_text(self):
+    def refresh_buttons_text(self, dirty=None):
         """
-        Refresh text on tiles
+        Refresh text on tiles with numbers in dirty, default to None for all tiles.
+        When game is finished tiles of winning line are refreshed too.
         """
-        for index, butt in enumerate(self.buttons):
-            array = self.game.board.tiles()[index].array()
+        tiles = self.game.board.tiles()
+        win_tiles = self.game.board.is_winner()[1] if self.game.is_finished() else []
+        if dirty is None:
+            dirty = range(len(self.buttons))
+        else:
+            dirty = sorted(set(dirty).union(win_tiles))
+        for index in dirty:
+            butt = self.buttons[index]
+            array = tiles[index].array()
             text = ''
             for move in array:
                 if move != array[0]:
-                    text += ', ' + move
+                    text += ', ' + format_move(move)
                 else:
-                    text += move
+                    text += format_move(move)
             butt.setText(str(text))
-            self.change_color(index, butt)
+            self.change_color(index, butt, tiles[index], win_tiles)
 
-    def change_color(self, index, button):
+    def change_color(self, index, button, tile, win_tiles):
         """
         Changes styleSheet on button when button is collapsed
+        or in winning line. Style is set only when it differs
+        from the last style of button.
         """
-        if self.game.is_finished() and index in self.game.board.is_winner()[1]:
-            style = "background-color: rgb(220,20,60);\nfont: 10pt \"MS Shell Dlg 2\";"
-            button.setStyleSheet(style)
+        if index in win_tiles:
+            style = WIN_STYLE
+        elif tile.is_collapsed():
+            style = COLLAPSED_STYLE
         else:
-            if self.game.board.tiles()[index].is_collapsed():
-                style = "background-color: rgb(32,178,170);\nfont: 10pt \"MS Shell Dlg 2\";"
-                button.setStyleSheet(style)
-            else:
-                style = "background-color: rgb(0, 85, 255);\ncolor: rgb(255, 255, 255);\nfont: 10pt \"MS Shell Dlg 2\";"
-                button.setStyleSheet(style)
+            style = OPEN_STYLE
+        if self.styles[index] is not style:
+            button.setStyleSheet(style)
+            self.styles[index] = style
 
     def to_collapse(self, button):
         """
@@ -227,6 +263,8 @@ class Ui_main_my(Ui_main):
             self.bot_mode = 'easy'
         elif action == self.actionHard:
             self.bot_mode = 'hard'
+        if getattr(self, 'bot', None) is not None:
+            self.bot.close()
         try:
             self.bot = Bot(self.bot_mode, self.myboard, self.game)
             self.info.setText('Your turn X')
@@ -254,9 +292,14 @@ class Ui_main_my(Ui_main):
 def main():
     app = QtWidgets.QApplication(sys.argv)
     main = QtWidgets.QMainWindow()
-    ui = Ui_main_my(main)
+    trace_path = os.environ.get('QTTT_TRACE')
+    tracer = Tracer() if trace_path else None
+    ui = Ui_main_my(main, tracer)
     main.show()
-    sys.exit(app.exec_())
+    code = app.exec_()
+    if tracer is not None:
+        tracer.write(trace_path)
+    sys.exit(code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,299 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+from quantum_tictactoe.position import Position
+
+
+class Node:
+    """
+    Node of Monte Carlo search tree
+    :param action: move or collapse which leads to this node
+    :type action: tuple
+
+    :param parent: parent node, None for root
+    :type parent: Node
+
+    :param player: player who chooses action in this node
+    :type player: int
+
+    :param untried: actions without child node
+    :type untried: list
+    """
+    __slots__ = ('action', 'parent', 'player', 'untried', 'children', 'visits', 'score')
+
+    def __init__(self, action, parent, position):
+        self.action = action
+        self.parent = parent
+        self.player = position.player
+        self.untried = actions(position)
+        self.children = []
+        self.visits = 0
+        self.score = 0.0
+
+    def select(self, exploration):
+        """
+        Returns child with the best UCT value
+        """
+        log_visits = log(self.visits)
+        best = None
+        best_value = -1.0
+        for child in self.children:
+            value = child.score / child.visits + exploration * sqrt(log_visits / child.visits)
+            if value > best_value:
+                best = child
+                best_value = value
+        return best
+
+
+def actions(position):
+    """
+    Returns collapse options if collapse is pending, otherwise pair moves
+    """
+    if position.pending >= 0:
+        return position.collapse_options()
+    return position.pair_moves()
+
+
+def apply(position, action):
+    """
+    Plays move or collapse on position
+    """
+    if position.pending >= 0:
+        position.collapse(*action)
+    else:
+        position.play(*action)
+
+
+def rollout(position, rng):
+    """
+    Plays random game to the end on position and returns the winner
+    """
+    while not position.is_finished():
+        choices = actions(position)
+        if not choices:
+            return 'unknown'
+        apply(position, rng.choice(choices))
+    return position.winner()
+
+
+class MCTS:
+    """
+    Monte Carlo tree search with UCT selection and random playouts.
+    Tree of chosen move is kept and used again in the next search.
+    :param iterations: number of playouts in one search
+    :type iterations: int
+
+    :param time_limit: maximal time of one search in seconds, None for no limit
+    :type time_limit: float
+
+    :param rng: random generator used in playouts, default to new Random
+    :type rng: Random
+
+    :param exploration: UCT exploration constant
+    :type exploration: float
+    """
+    def __init__(self, iterations=1000, time_limit=None, rng=None, exploration=1.4):
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._rng = Random() if rng is None else rng
+        self._exploration = exploration
+        self._root = None
+        self._root_position = None
+        self._stats = {'iterations': 0, 'seconds': 0.0, 'reused': 0}
+
+    def stats(self):
+        """
+        Returns dict with iterations, seconds and number of reused visits
+        of last search
+        """
+        return self._stats
+
+    def best_move(self, position):
+        """
+        Returns (first, second) tiles of best move in position,
+        None if there is no move
+        """
+        return self.search(position)
+
+    def best_collapse(self, position):
+        """
+        Returns (tile, move) of best collapse in position,
+        None if there is no collapse
+        """
+        return self.search(position)
+
+    def search(self, position):
+        """
+        Runs search from position and returns most visited action,
+        None if position has no actions
+        """
+        root = self.run(position)
+        if not root.children:
+            self._root = None
+            return None
+        best = max(root.children, key=lambda child: child.visits)
+        self._root = best
+        self._root_position = position.copy()
+        apply(self._root_position, best.action)
+        best.parent = None
+        return best.action
+
+    def run(self, position):
+        """
+        Runs playouts from position and returns root node.
+        Root of not finished game gets at least one playout,
+        even when iterations or time limit allow none.
+        """
+        start = perf_counter()
+        deadline = None if self._time_limit is None else start + self._time_limit
+        root = self._reuse(position)
+        reused = root.visits
+        iterations = 0
+        while True:
+            if root.children or not root.untried:
+                if iterations >= self._iterations:
+                    break
+                if deadline is not None and perf_counter() > deadline:
+                    break
+            self._playout(root, position.copy())
+            iterations += 1
+        self._stats = {'iterations': iterations, 'seconds': perf_counter() - start,
+                       'reused': reused}
+        return root
+
+    def _playout(self, root, position):
+        node = root
+        while not node.untried and node.children:
+            node = node.select(self._exploration)
+            apply(position, node.action)
+        if node.untried:
+            action = node.untried.pop(self._rng.randrange(len(node.untried)))
+            apply(position, action)
+            child = Node(action, node, position)
+            node.children.append(child)
+            node = child
+        winner = rollout(position, self._rng)
+        while node is not None:
+            node.visits += 1
+            if node.parent is not None:
+                if winner == node.parent.player:
+                    node.score += 1.0
+                elif winner == 'unknown':
+                    node.score += 0.5
+            node = node.parent
+
+    def _reuse(self, position):
+        """
+        Returns node of previous tree with the same position
+        or new root if there is no such node
+        """
+        key = position.key()
+        if self._root is not None:
+            level = [(self._root, self._root_position)]
+            for _ in range(4):
+                next_level = []
+                for node, node_position in level:
+                    if node_position.key() == key:
+                        node.parent = None
+                        return node
+                    for child in node.children:
+                        child_position = node_position.copy()
+                        apply(child_position, child.action)
+                        next_level.append((child, child_position))
+                level = next_level
+        return Node(None, None, position)
+
+
+def root_statistics(packed, iterations, time_limit, seed):
+    """
+    Runs independent search from packed position with its own seeded
+    generator and returns list of (action, visits, score) of root children
+    """
+    search = MCTS(iterations, time_limit, Random(seed))
+    root = search.run(Position.unpack(packed))
+    return [(child.action, child.visits, child.score) for child in root.children]
+
+
+class ParallelMCTS:
+    """
+    Root parallel Monte Carlo tree search.
+    Every worker process searches its own tree, visits of root children
+    are added and the most visited action is chosen.
+    :param workers: number of worker processes
+    :type workers: int
+
+    :param iterations: number of playouts of every worker
+    :type iterations: int
+
+    :param time_limit: maximal time of one search in seconds, None for no limit
+    :type time_limit: float
+
+    :param seed: seed of worker generators, default to random seed
+    :type seed: int
+    """
+    def __init__(self, workers=2, iterations=1000, time_limit=None, seed=None):
+        self._workers = workers
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._seed = Random().getrandbits(32) if seed is None else seed
+        self._searches = 0
+        self._pool = None
+        self._stats = {'iterations': 0, 'seconds': 0.0, 'workers': workers}
+
+    def stats(self):
+        """
+        Returns dict with iterations of all workers, seconds and workers
+        of last search
+        """
+        return self._stats
+
+    def best_move(self, position):
+        """
+        Returns (first, second) tiles of best move in position
+        """
+        return self.search(position)
+
+    def best_collapse(self, position):
+        """
+        Returns (tile, move) of best collapse in position
+        """
+        return self.search(position)
+
+    def search(self, position):
+        """
+        Runs searches in worker processes and returns action
+        with the most visits in all trees, random action if no worker
+        made a playout, None if position has no actions
+        """
+        if not actions(position):
+            return None
+        start = perf_counter()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self._workers)
+        packed = position.pack()
+        futures = []
+        for worker in range(self._workers):
+            seed = f'{self._seed}-{self._searches}-{worker}'
+            futures.append(self._pool.submit(root_statistics, packed, self._iterations,
+                                             self._time_limit, seed))
+        fallback = Random(f'{self._seed}-{self._searches}')
+        self._searches += 1
+        visits = {}
+        for future in futures:
+            for action, count, _ in future.result():
+                visits[action] = visits.get(action, 0) + count
+        self._stats = {'iterations': sum(visits.values()),
+                       'seconds': perf_counter() - start,
+                       'workers': self._workers}
+        if not visits:
+            return fallback.choice(actions(position))
+        return max(visits, key=lambda action: (visits[action], action))
+
+    def close(self):
+        """
+        Shuts down worker processes
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
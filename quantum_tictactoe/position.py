@@ -0,0 +1,172 @@
+from struct import Struct
+from quantum_tictactoe.engine import BoardEngine, X, make_move, move_player, move_number
+from quantum_tictactoe.engine import ZOBRIST_NUMBER, ZOBRIST_PLAYER, ZOBRIST_HALF, ZOBRIST_PENDING
+
+PACKED = Struct('<9Q9bBBbbH')
+
+
+class Position:
+    """
+    Light copy of game state which bots use to try moves
+    without changing Board of the game.
+    :param engine: BoardEngine with marks on tiles
+    :type engine: BoardEngine
+
+    :param player: player to move (X or Y)
+    :type player: int
+
+    :param number: round number of next move
+    :type number: int
+
+    :param half: tile with first half of current move, -1 if none
+    :type half: int
+
+    :param pending: move which closed a cycle and waits for collapse, -1 if none
+    :type pending: int
+    """
+    __slots__ = ('engine', 'player', 'number', 'half', 'pending')
+
+    def __init__(self, engine, player=X, number=1, half=-1, pending=-1):
+        self.engine = engine
+        self.player = player
+        self.number = number
+        self.half = half
+        self.pending = pending
+
+    @classmethod
+    def from_game(cls, game):
+        """
+        Returns position of game, board of the game is copied
+        """
+        move = game.whos_move()
+        half = -1 if game.is_first_move() else game.last_tile()
+        pending = game.last_move() if game.entanglement else -1
+        engine = game.board.engine().copy()
+        return cls(engine, move_player(move), move_number(move), half, pending)
+
+    @classmethod
+    def unpack(cls, data):
+        """
+        Returns position from bytes made by pack
+        """
+        values = PACKED.unpack(data)
+        player, number, half, pending, entangled = values[18:]
+        engine = BoardEngine.from_marks(values[:9], values[9:18], entangled, pending)
+        return cls(engine, player, number, half, pending)
+
+    def pack(self):
+        """
+        Returns position as compact bytes
+        """
+        engine = self.engine
+        return PACKED.pack(*engine.spooky, *engine.owner, self.player, self.number,
+                           self.half, self.pending, engine.entangled)
+
+    def copy(self):
+        """
+        Returns independent copy of position
+        """
+        return Position(self.engine.copy(), self.player, self.number,
+                        self.half, self.pending)
+
+    def move(self):
+        """
+        Returns move code of player to move
+        """
+        return make_move(self.player, self.number)
+
+    def free_tiles(self):
+        """
+        Returns list of tiles which are not collapsed
+        """
+        owner = self.engine.owner
+        return [tile for tile in range(9) if owner[tile] < 0]
+
+    def pair_moves(self):
+        """
+        Returns list of (first, second) tiles for every possible move,
+        empty list when collapse is pending or game is finished
+        """
+        if self.pending >= 0 or self.is_finished():
+            return []
+        free = self.free_tiles()
+        if self.half >= 0:
+            return [(self.half, tile) for tile in free if tile != self.half]
+        return [(first, second) for index, first in enumerate(free)
+                for second in free[index + 1:]]
+
+    def place(self, tile):
+        """
+        Places half of move on tile.
+        After second half returns True if the move closed a cycle.
+        """
+        move = self.move()
+        self.engine.place(tile, move)
+        if self.half < 0:
+            self.half = tile
+            return False
+        self.half = -1
+        self.number += 1
+        self.player ^= 1
+        component = self.engine.cycle_component(move)
+        if component:
+            self.engine.entangled = component
+            self.pending = move
+            return True
+        return False
+
+    def play(self, first, second):
+        """
+        Places both halves of move, returns True if it closed a cycle
+        """
+        if self.half < 0:
+            self.place(first)
+        return self.place(second)
+
+    def collapse_options(self):
+        """
+        Returns list of (tile, move) which could be collapsed,
+        the same choices as Board.could_collapse allows
+        """
+        return self.engine.collapse_options()
+
+    def collapse(self, tile, move):
+        """
+        Collapses move on tile, returns list of (tile, move) which became classical
+        """
+        changed = self.engine.collapse(tile, move)
+        self.engine.entangled = 0
+        self.pending = -1
+        return changed
+
+    def chooser(self):
+        """
+        Returns player who chooses collapse, it is the opponent
+        of player who closed the cycle
+        """
+        return self.player
+
+    def winner(self):
+        """
+        Returns X, Y, 'unknown' for draw or None if game is not finished
+        """
+        return self.engine.result()[0]
+
+    def is_finished(self):
+        """
+        Returns true if game is finished
+        """
+        return self.pending < 0 and self.engine.result()[0] is not None
+
+    def key(self):
+        """
+        Returns Zobrist hash of position
+        """
+        key = self.engine.zobrist ^ ZOBRIST_NUMBER[self.number]
+        if self.player != X:
+            key ^= ZOBRIST_PLAYER
+        if self.half >= 0:
+            key ^= ZOBRIST_HALF[self.half]
+        if self.pending >= 0:
+            key ^= ZOBRIST_PENDING
+        return key
@@ -0,0 +1,161 @@
+from struct import Struct
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.engine import BoardEngine
+from quantum_tictactoe.game import Game
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.tile import Tile
+
+MAGIC = b'QTTR\x01'
+LENGTH = Struct('<H')
+MOVE = 0
+COLLAPSE = 1
+
+
+class RecordError(Exception):
+    pass
+
+
+def encode_record(actions):
+    """
+    Returns bytes of game given as list of (kind, first, second) actions,
+    where kind is MOVE with two tiles or COLLAPSE with tile and move code.
+    Move takes one byte, collapse two bytes.
+    """
+    data = bytearray()
+    for kind, first, second in actions:
+        if kind == MOVE:
+            data.append(first * 9 + second)
+        else:
+            data.append(0x80 | first)
+            data.append(second)
+    return bytes(data)
+
+
+def decode_record(data):
+    """
+    Returns list of actions of game encoded by encode_record
+    """
+    actions = []
+    index = 0
+    while index < len(data):
+        byte = data[index]
+        if byte & 0x80:
+            if index + 1 >= len(data):
+                raise RecordError('Record ends inside collapse')
+            actions.append((COLLAPSE, byte & 0x7f, data[index + 1]))
+            index += 2
+        else:
+            actions.append((MOVE, byte // 9, byte % 9))
+            index += 1
+    return actions
+
+
+class RecordWriter:
+    """
+    Appends games to file of length prefixed records
+    :param path: path of record file, created with header if missing
+        or empty, other files must start with the header
+    :type path: str
+    """
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            with open(path, 'rb') as handle:
+                magic = handle.read(len(MAGIC))
+            if magic != MAGIC:
+                self._file.close()
+                raise RecordError(f'{path} is not game record file')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, actions):
+        """
+        Appends game given as list of actions
+        """
+        data = encode_record(actions)
+        self._file.write(LENGTH.pack(len(data)))
+        self._file.write(data)
+
+    def close(self):
+        """
+        Flushes and closes file
+        """
+        self._file.close()
+
+
+class RecordReader:
+    """
+    Reads games from record file one by one
+    :param path: path of record file
+    :type path: str
+    """
+    def __init__(self, path):
+        self._path = path
+
+    def __iter__(self):
+        """
+        Yields list of actions of every game in file
+        """
+        with open(self._path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise RecordError(f'{self._path} is not game record file')
+            while True:
+                prefix = handle.read(LENGTH.size)
+                if not prefix:
+                    return
+                if len(prefix) < LENGTH.size:
+                    raise RecordError('Record file ends inside record')
+                size = LENGTH.unpack(prefix)[0]
+                data = handle.read(size)
+                if len(data) < size:
+                    raise RecordError('Record file ends inside record')
+                yield decode_record(data)
+
+
+def new_game():
+    """
+    Returns Game on empty board
+    """
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    return Game(Board(tiles))
+
+
+def replay(actions, game=None):
+    """
+    Plays actions on game, default to new game, and returns it
+    """
+    game = new_game() if game is None else game
+    for kind, first, second in actions:
+        if kind == MOVE:
+            game.make_move(first, second)
+        else:
+            game.make_collapse(first, second)
+    return game
+
+
+def positions(actions):
+    """
+    Yields Position after every action of game
+    """
+    position = Position(BoardEngine())
+    for kind, first, second in actions:
+        apply_action(position, kind, first, second)
+        yield position.copy()
+
+
+def apply_action(position, kind, first, second):
+    """
+    Plays move or collapse action on position
+    """
+    if kind == MOVE:
+        position.play(first, second)
+    else:
+        position.collapse(first, second)
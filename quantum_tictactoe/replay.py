@@ -0,0 +1,66 @@
+from quantum_tictactoe.engine import BoardEngine
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.record import MOVE, new_game, apply_action
+
+
+class Replay:
+    """
+    Recorded game which can be seeked to any ply.
+    Packed position is kept every interval plies, so seek replays
+    at most interval - 1 actions from the nearest snapshot.
+    Ply 0 is empty board, ply n is state after n actions.
+    :param actions: actions of game like in RecordReader
+    :type actions: list
+
+    :param interval: number of plies between snapshots
+    :type interval: int
+    """
+    def __init__(self, actions, interval=8):
+        self._actions = list(actions)
+        self._interval = interval
+        self._snapshots = []
+        self._last_tiles = []
+        position = Position(BoardEngine())
+        last_tile = ''
+        for ply, (kind, first, second) in enumerate(self._actions):
+            if ply % interval == 0:
+                self._snapshots.append(position.pack())
+            self._last_tiles.append(last_tile)
+            apply_action(position, kind, first, second)
+            if kind == MOVE:
+                last_tile = second
+        if len(self._actions) % interval == 0:
+            self._snapshots.append(position.pack())
+        self._last_tiles.append(last_tile)
+
+    def __len__(self):
+        """
+        Returns number of plies of game
+        """
+        return len(self._actions)
+
+    def actions(self):
+        """
+        Returns list of actions of game
+        """
+        return self._actions
+
+    def position(self, ply):
+        """
+        Returns Position at ply
+        """
+        if ply < 0 or ply > len(self._actions):
+            raise IndexError(f'Game has plies from 0 to {len(self._actions)}')
+        start = ply // self._interval * self._interval
+        position = Position.unpack(self._snapshots[start // self._interval])
+        for kind, first, second in self._actions[start:ply]:
+            apply_action(position, kind, first, second)
+        return position
+
+    def game(self, ply, game=None):
+        """
+        Sets game, default to new game, to state at ply and returns it
+        """
+        game = new_game() if game is None else game
+        game.load(self.position(ply), self._last_tiles[ply])
+        return game
@@ -0,0 +1,221 @@
+from time import perf_counter
+from quantum_tictactoe.engine import X, LINES, TILE_LINES, iter_bits
+from quantum_tictactoe.table import TranspositionTable
+from quantum_tictactoe.symmetry import canonical_key, map_action, unmap_action
+
+WIN_SCORE = 1000
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+X_MOVES = int('01' * 64, 2)
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def evaluate(position):
+    """
+    Returns score of position for player to move.
+    Counts collapsed tiles on lines still open for player
+    and spooky marks on tiles weighted by number of lines through tile.
+    """
+    engine = position.engine
+    player = position.player
+    own = engine.line_count(player)
+    other = engine.line_count(player ^ 1)
+    score = 0
+    for line in range(8):
+        if other[line] == 0:
+            score += own[line] * own[line]
+        if own[line] == 0:
+            score -= other[line] * other[line]
+    score *= 10
+    own_moves = X_MOVES if player == X else X_MOVES << 1
+    for tile in iter_bits(~(engine.classical[0] | engine.classical[1]) & 0x1ff):
+        marks = engine.spooky[tile]
+        mine = bin(marks & own_moves).count('1')
+        score += (2 * mine - bin(marks).count('1')) * len(TILE_LINES[tile])
+    return score
+
+
+def order_collapses(position, choices):
+    """
+    Returns collapse choices sorted by lines completed in their
+    collapse preview, lines of player to move first
+    """
+    engine = position.engine
+    player = position.player
+
+    def lines(choice):
+        owner = engine.collapse_preview(*choice)
+        score = 0
+        for line in LINES:
+            moves = [owner[tile] for tile in line]
+            if min(moves) < 0:
+                continue
+            players = {move & 1 for move in moves}
+            if players == {player}:
+                score -= 1
+            elif players == {player ^ 1}:
+                score += 1
+        return score
+    return sorted(choices, key=lines)
+
+
+class AlphaBeta:
+    """
+    Depth limited alpha-beta search over moves and collapse choices
+    with transposition table and iterative deepening.
+    Table is kept between searches, so positions reached again
+    in the next moves are not searched again.
+    Collapse is chosen by the opponent of player who closed the cycle,
+    so collapse nodes are decision nodes of player to move.
+    :param depth: maximal number of moves searched
+    :type depth: int
+
+    :param node_limit: maximal number of nodes in one search, None for no limit
+    :type node_limit: int
+
+    :param time_limit: maximal time of one search in seconds, None for no limit
+    :type time_limit: float
+
+    :param table: transposition table, default to new TranspositionTable
+    :type table: TranspositionTable
+
+    :param symmetric: if true table is keyed by canonical position,
+        so symmetric positions share entry, default to false
+    :type symmetric: boolean
+    """
+    def __init__(self, depth=3, node_limit=None, time_limit=None, table=None,
+                 symmetric=False):
+        self._depth = depth
+        self._node_limit = node_limit
+        self._time_limit = time_limit
+        self._table = TranspositionTable() if table is None else table
+        self._symmetric = symmetric
+        self._nodes = 0
+        self._deadline = None
+        self._stats = {'nodes': 0, 'seconds': 0.0, 'nodes_per_second': 0.0, 'depth': 0}
+
+    def stats(self):
+        """
+        Returns dict with nodes, seconds, nodes_per_second and depth
+        of last search
+        """
+        return self._stats
+
+    def best_move(self, position):
+        """
+        Returns (first, second) tiles of best move in position,
+        None if there is no move
+        """
+        return self._search(position, position.pair_moves())
+
+    def best_collapse(self, position):
+        """
+        Returns (tile, move) of best collapse in position,
+        None if there is no collapse
+        """
+        return self._search(position, order_collapses(position, position.collapse_options()))
+
+    def _search(self, position, choices):
+        start = perf_counter()
+        self._nodes = 0
+        if not choices:
+            self._stats = {'nodes': 0, 'seconds': 0.0, 'nodes_per_second': 0.0, 'depth': 0}
+            return None
+        self._deadline = None if self._time_limit is None else start + self._time_limit
+        best = choices[0]
+        reached = 0
+        for depth in range(1, self._depth + 1):
+            try:
+                best = self._root(position, choices, depth, best)
+            except SearchTimeout:
+                break
+            reached = depth
+        seconds = perf_counter() - start
+        self._stats = {
+            'nodes': self._nodes,
+            'seconds': seconds,
+            'nodes_per_second': self._nodes / seconds if seconds > 0 else 0.0,
+            'depth': reached,
+        }
+        return best
+
+    def _root(self, position, choices, depth, previous):
+        ordered = [previous] + [choice for choice in choices if choice != previous]
+        best = previous
+        alpha = -WIN_SCORE * 2
+        for choice in ordered:
+            value = self._child(position, choice, depth, alpha, WIN_SCORE * 2)
+            if value > alpha:
+                alpha = value
+                best = choice
+        return best
+
+    def _child(self, position, choice, depth, alpha, beta):
+        child = position.copy()
+        if position.pending >= 0:
+            child.collapse(*choice)
+            return self._negamax(child, depth, alpha, beta)
+        child.play(*choice)
+        return -self._negamax(child, depth - 1, -beta, -alpha)
+
+    def _negamax(self, position, depth, alpha, beta):
+        self._nodes += 1
+        if self._node_limit is not None and self._nodes > self._node_limit:
+            raise SearchTimeout()
+        if self._deadline is not None and perf_counter() > self._deadline:
+            raise SearchTimeout()
+        winner = position.winner() if position.pending < 0 else None
+        if winner is not None:
+            if winner == 'unknown':
+                return 0
+            score = WIN_SCORE + depth
+            return score if winner == position.player else -score
+        if depth <= 0:
+            return evaluate(position)
+        if position.pending >= 0:
+            choices = order_collapses(position, position.collapse_options())
+        else:
+            choices = position.pair_moves()
+        if not choices:
+            return evaluate(position)
+        if self._symmetric:
+            key, transform = canonical_key(position)
+        else:
+            key, transform = position.key(), 0
+        entry = self._table.get(key)
+        if entry is not None:
+            entry_depth, value, flag, best = entry
+            best = unmap_action(best, transform, position)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+            choices = [best] + [choice for choice in choices if choice != best]
+        original_alpha = alpha
+        best_value = -WIN_SCORE * 2
+        best = choices[0]
+        for choice in choices:
+            value = self._child(position, choice, depth, alpha, beta)
+            if value > best_value:
+                best_value = value
+                best = choice
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+        if best_value <= original_alpha:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._table.store(key, depth, best_value, flag, map_action(best, transform, position))
+        return best_value
@@ -0,0 +1,260 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from random import Random
+from time import perf_counter
+import json
+from quantum_tictactoe.bot import Bot, BotTypeError
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.engine import X, Y, move_player
+from quantum_tictactoe.game import Game
+from quantum_tictactoe import record
+from quantum_tictactoe.instrument import enable, disable, reset, snapshot, merge_snapshot
+from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.tracer import Tracer, span, BOT_MOVE, ENTANGLEMENT, COLLAPSE, WIN_CHECK
+
+PHASES = (BOT_MOVE, ENTANGLEMENT, COLLAPSE, WIN_CHECK)
+
+
+class Simulator:
+    """
+    Plays games between two bots without input and output.
+    Game result is tuple (winner, length, collapses), where winner
+    is 'x', 'y' or 'unknown' and length is number of moves.
+    :param x_mode: mode of bot playing X
+    :type x_mode: str
+
+    :param y_mode: mode of bot playing Y
+    :type y_mode: str
+
+    :param x_options: keyword arguments of X bot, default to None
+    :type x_options: dict
+
+    :param y_options: keyword arguments of Y bot, default to None
+    :type y_options: dict
+
+    :param seed: seed of bots generators, default to None for module random
+    :type seed: int or str
+
+    :param writer: RecordWriter which gets every played game, default to None
+    :type writer: RecordWriter
+
+    :param tracer: Tracer which gets span of every phase, default to None
+    :type tracer: Tracer
+    """
+    def __init__(self, x_mode='easy', y_mode='easy', x_options=None, y_options=None,
+                 seed=None, writer=None, tracer=None):
+        if x_mode == 'none' or y_mode == 'none':
+            raise BotTypeError('Simulator needs two bots')
+        tiles = []
+        for _ in range(9):
+            tiles.append(Tile())
+        self.board = Board(tiles)
+        self.game = Game(self.board)
+        x_options = dict(x_options or {})
+        y_options = dict(y_options or {})
+        if seed is not None:
+            x_options.setdefault('rng', Random(f'{seed}-x'))
+            y_options.setdefault('rng', Random(f'{seed}-y'))
+        self._bots = [Bot(x_mode, self.board, self.game, **x_options),
+                      Bot(y_mode, self.board, self.game, **y_options)]
+        self._writer = writer
+        self._tracer = tracer
+        self._games = 0
+        self._seconds = 0.0
+        self._calls = dict.fromkeys(PHASES, 0)
+        self._times = dict.fromkeys(PHASES, 0.0)
+
+    def play_game(self):
+        """
+        Plays one game and returns (winner, length, collapses)
+        """
+        game = self.game
+        board = self.board
+        calls = self._calls
+        times = self._times
+        tracer = self._tracer
+        game.clear_game()
+        collapses = 0
+        actions = []
+        start = perf_counter()
+        while True:
+            bot = self._bots[move_player(game.whos_move())]
+            turn = game.counter()
+            moment = perf_counter()
+            with span(tracer, BOT_MOVE, game=self._games, turn=turn):
+                tiles = bot.move()
+                actions.append((record.MOVE, tiles[0], tiles[1]))
+                game.set_last_tile(tiles[1])
+                game.set_last_move(game.whos_move())
+                game.increase_counter()
+            now = perf_counter()
+            times[BOT_MOVE] += now - moment
+            calls[BOT_MOVE] += 1
+            moment = now
+            with span(tracer, ENTANGLEMENT, game=self._games, turn=turn):
+                game.game_entanglement()
+            now = perf_counter()
+            times[ENTANGLEMENT] += now - moment
+            calls[ENTANGLEMENT] += 1
+            if not game.entanglement:
+                continue
+            moment = now
+            chooser = self._bots[Y if game.last_player() == X else X]
+            with span(tracer, COLLAPSE, game=self._games, turn=turn):
+                collapse = chooser.collapse()
+                actions.append((record.COLLAPSE, collapse[0], collapse[1]))
+                game.game_collapse(chooser, 'none', collapse)
+                board.reset_entangl_tiles()
+            collapses += 1
+            now = perf_counter()
+            times[COLLAPSE] += now - moment
+            calls[COLLAPSE] += 1
+            moment = now
+            with span(tracer, WIN_CHECK, game=self._games, turn=turn):
+                finished = game.is_game_end()
+            now = perf_counter()
+            times[WIN_CHECK] += now - moment
+            calls[WIN_CHECK] += 1
+            if finished:
+                break
+        self._games += 1
+        self._seconds += perf_counter() - start
+        if self._writer is not None:
+            self._writer.write(actions)
+        return board.is_winner()[0], game.counter() - 1, collapses
+
+    def close(self):
+        """
+        Stops worker processes of bots
+        """
+        for bot in self._bots:
+            bot.close()
+
+    def run(self, games):
+        """
+        Plays number of games and returns list of their results
+        """
+        return [self.play_game() for _ in range(games)]
+
+    def report(self):
+        """
+        Returns dict with games, seconds, games_per_second
+        and for every phase its calls, seconds and mean time
+        """
+        phases = {}
+        for phase in PHASES:
+            calls = self._calls[phase]
+            seconds = self._times[phase]
+            phases[phase] = {'calls': calls, 'seconds': seconds,
+                             'mean': seconds / calls if calls else 0.0}
+        return {
+            'games': self._games,
+            'seconds': self._seconds,
+            'games_per_second': self._games / self._seconds if self._seconds else 0.0,
+            'phases': phases,
+        }
+
+
+def new_summary():
+    """
+    Returns empty summary of games
+    """
+    return {'games': 0, 'x': 0, 'y': 0, 'unknown': 0, 'moves': 0, 'collapses': 0,
+            'phases': dict.fromkeys(PHASES, 0.0), 'instrumentation': {}}
+
+
+def merge_summary(summary, other):
+    """
+    Adds other summary to summary
+    """
+    for key in ['games', 'x', 'y', 'unknown', 'moves', 'collapses']:
+        summary[key] += other[key]
+    for phase in PHASES:
+        summary['phases'][phase] += other['phases'][phase]
+    merge_snapshot(summary['instrumentation'], other['instrumentation'])
+
+
+def run_shard(x_mode, y_mode, games, seed, instrument=False, tracer=None):
+    """
+    Plays games with bots seeded by seed and returns their summary.
+    With instrument summary has counters of instrumented methods,
+    tracer gets spans of phases of every game.
+    """
+    simulator = Simulator(x_mode, y_mode, seed=seed, tracer=tracer)
+    summary = new_summary()
+    if instrument:
+        reset()
+        enable()
+    try:
+        for _ in range(games):
+            winner, length, collapses = simulator.play_game()
+            summary['games'] += 1
+            summary[winner] += 1
+            summary['moves'] += length
+            summary['collapses'] += collapses
+    finally:
+        simulator.close()
+        if instrument:
+            disable()
+            summary['instrumentation'] = snapshot()
+    for phase, times in simulator.report()['phases'].items():
+        summary['phases'][phase] = times['seconds']
+    return summary
+
+
+def run_batch(games, workers=1, seed=0, x_mode='easy', y_mode='easy', shard_size=1000,
+              instrument=False, tracer=None):
+    """
+    Splits games into shards of shard_size games, plays them in worker
+    processes and returns summary of all games.
+    Shard number n uses seed f'{seed}-n', so result does not depend
+    on number of workers. Tracer can be used only with one worker.
+    """
+    if tracer is not None and workers > 1:
+        raise ValueError('Tracer needs one worker')
+    start = perf_counter()
+    sizes = [min(shard_size, games - first) for first in range(0, games, shard_size)]
+    seeds = [f'{seed}-{shard}' for shard in range(len(sizes))]
+    summary = new_summary()
+    if workers <= 1:
+        for size, shard_seed in zip(sizes, seeds):
+            merge_summary(summary, run_shard(x_mode, y_mode, size, shard_seed, instrument,
+                                             tracer))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            shards = pool.map(run_shard, repeat(x_mode), repeat(y_mode), sizes, seeds,
+                              repeat(instrument))
+            for shard in shards:
+                merge_summary(summary, shard)
+    seconds = perf_counter() - start
+    summary['seconds'] = seconds
+    summary['games_per_second'] = games / seconds if seconds else 0.0
+    return summary
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Plays games between two bots')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--x', default='easy', help='mode of bot playing X')
+    parser.add_argument('--y', default='easy', help='mode of bot playing Y')
+    parser.add_argument('--shard-size', type=int, default=1000)
+    parser.add_argument('--instrument', action='store_true',
+                        help='count calls and time of key methods')
+    parser.add_argument('--trace', default=None,
+                        help='path of Chrome trace of game phases, needs one worker')
+    args = parser.parse_args(argv)
+    if args.trace is not None and args.workers > 1:
+        parser.error('--trace needs one worker')
+    tracer = Tracer() if args.trace is not None else None
+    summary = run_batch(args.games, args.workers, args.seed, args.x, args.y, args.shard_size,
+                        args.instrument, tracer)
+    if tracer is not None:
+        tracer.write(args.trace)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+from argparse import ArgumentParser
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import json
+import os
+from quantum_tictactoe.engine import BoardEngine, PLAYERS
+from quantum_tictactoe.mcts import actions, apply
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.symmetry import canonical_key
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+
+class Solver:
+    """
+    Exhaustive search which finds game value of positions with perfect play.
+    Value is WIN, DRAW or LOSS for player to move, who also chooses
+    collapse when it is pending. Values are memoized by canonical key,
+    so symmetric positions are solved once.
+    :param checkpoint: path of file where memo is saved, it is loaded
+        if it exists, default to None for no file
+    :type checkpoint: str
+
+    :param checkpoint_every: number of solved positions between saves
+    :type checkpoint_every: int
+    """
+    def __init__(self, checkpoint=None, checkpoint_every=1000000):
+        self._checkpoint = checkpoint
+        self._checkpoint_every = checkpoint_every
+        self._memo = {}
+        self._nodes = 0
+        self._unsaved = 0
+        self._seconds = 0.0
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._memo = load_memo(checkpoint)
+
+    def stats(self):
+        """
+        Returns dict with nodes, positions in memo and seconds of solving
+        """
+        return {'nodes': self._nodes, 'positions': len(self._memo),
+                'seconds': self._seconds}
+
+    def memo(self):
+        """
+        Returns dict of canonical key and value of solved positions
+        """
+        return self._memo
+
+    def solve(self, position):
+        """
+        Returns value of position for player to move.
+        Memo is saved when solving is interrupted.
+        """
+        start = perf_counter()
+        try:
+            return self._solve(position)
+        except KeyboardInterrupt:
+            self.save()
+            raise
+        finally:
+            self._seconds += perf_counter() - start
+
+    def best_action(self, position):
+        """
+        Returns (action, value) of the best move or collapse in position
+        """
+        best = None
+        best_value = LOSS - 1
+        for action in actions(position):
+            child = position.copy()
+            apply(child, action)
+            value = self.solve(child)
+            if child.player != position.player:
+                value = -value
+            if value > best_value:
+                best = action
+                best_value = value
+        return best, best_value
+
+    def save(self):
+        """
+        Saves memo to checkpoint file
+        """
+        if self._checkpoint is not None:
+            save_memo(self._checkpoint, self._memo)
+        self._unsaved = 0
+
+    def _solve(self, position):
+        self._nodes += 1
+        if position.pending < 0:
+            winner = position.winner()
+            if winner == 'unknown':
+                return DRAW
+            if winner is not None:
+                return WIN if winner == position.player else LOSS
+        key = canonical_key(position)[0]
+        value = self._memo.get(key)
+        if value is not None:
+            return value
+        choices = actions(position)
+        value = DRAW if not choices else LOSS
+        for action in choices:
+            child = position.copy()
+            apply(child, action)
+            child_value = self._solve(child)
+            if child.player != position.player:
+                child_value = -child_value
+            if child_value > value:
+                value = child_value
+                if value == WIN:
+                    break
+        self._memo[key] = value
+        self._unsaved += 1
+        if self._unsaved >= self._checkpoint_every:
+            self.save()
+        return value
+
+
+def save_memo(path, memo):
+    """
+    Writes memo as count, keys and values to path.
+    File is replaced only after it is written.
+    """
+    keys = array('Q', memo.keys())
+    values = array('b', memo.values())
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as handle:
+        array('Q', [len(keys)]).tofile(handle)
+        keys.tofile(handle)
+        values.tofile(handle)
+    os.replace(temporary, path)
+
+
+def load_memo(path):
+    """
+    Returns memo written by save_memo
+    """
+    with open(path, 'rb') as handle:
+        count = array('Q')
+        count.fromfile(handle, 1)
+        keys = array('Q')
+        keys.fromfile(handle, count[0])
+        values = array('b')
+        values.fromfile(handle, count[0])
+    return dict(zip(keys, values))
+
+
+def openings(position):
+    """
+    Returns list of moves of position which lead to different
+    canonical positions
+    """
+    seen = set()
+    result = []
+    for action in actions(position):
+        child = position.copy()
+        apply(child, action)
+        key = canonical_key(child)[0]
+        if key not in seen:
+            seen.add(key)
+            result.append(action)
+    return result
+
+
+def solve_opening(packed, action, checkpoint=None, checkpoint_every=1000000):
+    """
+    Solves packed position after action and returns
+    (action, value for player who made the action, stats)
+    """
+    position = Position.unpack(packed)
+    child = position.copy()
+    apply(child, action)
+    solver = Solver(checkpoint, checkpoint_every)
+    value = solver.solve(child)
+    solver.save()
+    if child.player != position.player:
+        value = -value
+    return action, value, solver.stats()
+
+
+def solve_openings(position=None, workers=1, checkpoint=None, checkpoint_every=1000000):
+    """
+    Solves every canonical opening of position, default to empty board,
+    in worker processes. Opening number n saves its memo in f'{checkpoint}-n',
+    so stopped run continues from saved memos.
+    Returns dict with value of position and list of (action, value) of openings.
+    """
+    position = Position(BoardEngine()) if position is None else position
+    start = perf_counter()
+    moves = openings(position)
+    paths = [None if checkpoint is None else f'{checkpoint}-{index}'
+             for index in range(len(moves))]
+    packed = position.pack()
+    if workers <= 1:
+        results = [solve_opening(packed, action, path, checkpoint_every)
+                   for action, path in zip(moves, paths)]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(solve_opening, packed, action, path, checkpoint_every)
+                       for action, path in zip(moves, paths)]
+            results = [future.result() for future in futures]
+    values = [(action, value) for action, value, _ in results]
+    return {
+        'player': PLAYERS[position.player],
+        'value': max(value for _, value in values) if values else DRAW,
+        'openings': values,
+        'nodes': sum(stats['nodes'] for _, _, stats in results),
+        'seconds': perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Solves quantum tic-tac-toe with perfect play')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--checkpoint', default=None, help='prefix of checkpoint files')
+    parser.add_argument('--checkpoint-every', type=int, default=1000000)
+    args = parser.parse_args(argv)
+    summary = solve_openings(None, args.workers, args.checkpoint, args.checkpoint_every)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+from quantum_tictactoe.engine import BoardEngine, X, iter_bits
+from quantum_tictactoe.engine import ZOBRIST_SPOOKY, ZOBRIST_OWNER, ZOBRIST_NUMBER
+from quantum_tictactoe.engine import ZOBRIST_PLAYER, ZOBRIST_HALF, ZOBRIST_PENDING
+from quantum_tictactoe.position import Position
+
+
+def _transform(row_column):
+    return tuple(3 * row + column for row, column in
+                 (row_column(tile // 3, tile % 3) for tile in range(9)))
+
+
+TRANSFORMS = (
+    _transform(lambda row, column: (row, column)),
+    _transform(lambda row, column: (column, 2 - row)),
+    _transform(lambda row, column: (2 - row, 2 - column)),
+    _transform(lambda row, column: (2 - column, row)),
+    _transform(lambda row, column: (row, 2 - column)),
+    _transform(lambda row, column: (2 - row, column)),
+    _transform(lambda row, column: (column, row)),
+    _transform(lambda row, column: (2 - column, 2 - row)),
+)
+INVERSE = tuple(TRANSFORMS.index(tuple(transform.index(tile) for tile in range(9)))
+                for transform in TRANSFORMS)
+
+
+def map_tile(tile, transform):
+    """
+    Returns tile number after transform, -1 stays -1
+    """
+    return TRANSFORMS[transform][tile] if tile >= 0 else tile
+
+
+def map_mask(mask, transform):
+    """
+    Returns bitmask of tiles after transform
+    """
+    tiles = TRANSFORMS[transform]
+    mapped = 0
+    for tile in iter_bits(mask):
+        mapped |= 1 << tiles[tile]
+    return mapped
+
+
+def map_action(action, transform, position):
+    """
+    Returns action of position, move (first, second) or collapse (tile, move),
+    as action of position after transform.
+    Tiles of move are sorted like in Position.pair_moves.
+    """
+    if position.pending >= 0:
+        return map_tile(action[0], transform), action[1]
+    first, second = map_tile(action[0], transform), map_tile(action[1], transform)
+    if position.half < 0 and first > second:
+        return second, first
+    return first, second
+
+
+def unmap_action(action, transform, position):
+    """
+    Returns action of transformed position as action of original position
+    """
+    return map_action(action, INVERSE[transform], position)
+
+
+def transform_position(position, transform):
+    """
+    Returns new position with tiles moved by transform
+    """
+    tiles = TRANSFORMS[transform]
+    spooky = [0] * 9
+    owner = [-1] * 9
+    for tile in range(9):
+        spooky[tiles[tile]] = position.engine.spooky[tile]
+        owner[tiles[tile]] = position.engine.owner[tile]
+    entangled = map_mask(position.engine.entangled, transform)
+    engine = BoardEngine.from_marks(spooky, owner, entangled, position.pending)
+    return Position(engine, position.player, position.number,
+                    map_tile(position.half, transform), position.pending)
+
+
+def transformed_key(position, transform):
+    """
+    Returns key of position after transform without building it
+    """
+    tiles = TRANSFORMS[transform]
+    engine = position.engine
+    key = ZOBRIST_NUMBER[position.number]
+    for tile in range(9):
+        mapped = tiles[tile]
+        if engine.owner[tile] >= 0:
+            key ^= ZOBRIST_OWNER[mapped][engine.owner[tile]]
+        for move in iter_bits(engine.spooky[tile]):
+            key ^= ZOBRIST_SPOOKY[mapped][move]
+    if position.player != X:
+        key ^= ZOBRIST_PLAYER
+    if position.half >= 0:
+        key ^= ZOBRIST_HALF[tiles[position.half]]
+    if position.pending >= 0:
+        key ^= ZOBRIST_PENDING
+    return key
+
+
+def canonical_key(position):
+    """
+    Returns (key, transform) with the lowest key of all eight
+    symmetries of position and transform which gives it
+    """
+    return min((transformed_key(position, transform), transform)
+               for transform in range(len(TRANSFORMS)))
+
+
+def canonical(position):
+    """
+    Returns (position, transform) where position is representative
+    of all symmetric positions, actions found in it are mapped back
+    with unmap_action
+    """
+    _, transform = canonical_key(position)
+    return transform_position(position, transform), transform
+
+
+def canonical_game(game):
+    """
+    Returns canonical (position, transform) of game state
+    """
+    return canonical(Position.from_game(game))
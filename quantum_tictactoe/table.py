@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+REPLACE_POLICIES = ('always', 'depth')
+EVICT_POLICIES = ('lru', 'fifo')
+
+
+class TranspositionTable:
+    """
+    Bounded table of search results keyed by Zobrist hash of position.
+    Entry is tuple (depth, value, flag, best).
+    :param size: maximal number of entries
+    :type size: int
+
+    :param replace: 'always' overwrites entry of the same position,
+        'depth' keeps entry searched deeper, default to 'depth'
+    :type replace: str
+
+    :param evict: entry removed when table is full, 'lru' the least
+        recently used one, 'fifo' the oldest stored one, default to 'lru'
+    :type evict: str
+    """
+    def __init__(self, size=100000, replace='depth', evict='lru'):
+        if replace not in REPLACE_POLICIES:
+            raise ValueError(f'Replace policy must be one of {REPLACE_POLICIES}')
+        if evict not in EVICT_POLICIES:
+            raise ValueError(f'Evict policy must be one of {EVICT_POLICIES}')
+        self._size = size
+        self._replace = replace
+        self._evict = evict
+        self._entries = OrderedDict()
+        self._stats = dict.fromkeys(['hits', 'misses', 'stores', 'evictions'], 0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        """
+        Returns dict with hits, misses, stores and evictions
+        """
+        return dict(self._stats, entries=len(self._entries))
+
+    def get(self, key):
+        """
+        Returns entry of key or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats['misses'] += 1
+            return None
+        self._stats['hits'] += 1
+        if self._evict == 'lru':
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key, depth, value, flag, best):
+        """
+        Stores entry of key using replace policy,
+        removes one entry when table is full
+        """
+        entries = self._entries
+        old = entries.get(key)
+        if old is not None:
+            if self._replace == 'depth' and old[0] > depth:
+                return
+        elif len(entries) >= self._size:
+            entries.popitem(last=False)
+            self._stats['evictions'] += 1
+        entries[key] = (depth, value, flag, best)
+        if self._evict == 'lru':
+            entries.move_to_end(key)
+        self._stats['stores'] += 1
+
+    def clear(self):
+        """
+        Removes all entries
+        """
+        self._entries.clear()
@@ -1,7 +1,9 @@
 class Tile:
     """
     Tile class
-    Contains array of player and bot moves, entanglement and collapsed move.
+    Contains array of player and bot move codes, entanglement and collapsed move.
+    When tile is added to Board its state is kept in board engine
+    and tile only reads and writes it.
     :param array: array of moves, default to empty list
     :type array: list
 
@@ -12,6 +14,8 @@ class Tile:
     :type is_collapsed: boolean
 
     """
+    __slots__ = ('_array', '_is_entanglement', '_is_collapsed', '_engine', '_index')
+
     def __init__(self, array=None, is_entanglement=False, is_collapsed=False):
         if array is None:
             self._array = []
@@ -19,17 +23,39 @@ class Tile:
             self._array = array
         self._is_entanglement = is_entanglement
         self._is_collapsed = is_collapsed
+        self._engine = None
+        self._index = None
+
+    def bind(self, engine, index):
+        """
+        Moves tile state to board engine under index
+        """
+        engine.clear(index)
+        if self._is_collapsed and self._array:
+            engine.set_collapsed(index, self._array[0])
+        else:
+            for move in self._array:
+                engine.place(index, move)
+        engine.set_entangled(index, self._is_entanglement)
+        self._engine = engine
+        self._index = index
+        self._array = None
 
     def array(self):
         """
         Returns list of moves set on tile
         """
-        return self._array
+        if self._engine is None:
+            return self._array
+        return self._engine.moves(self._index)
 
     def remove_move(self, move):
         """
         Removes move from array
         """
+        if self._engine is not None:
+            self._engine.remove(self._index, move)
+            return
         new_array = []
         for mv in self._array:
             if mv != move:
@@ -41,6 +67,9 @@ class Tile:
         Clear all move from tile
         and returns default variables
         """
+        if self._engine is not None:
+            self._engine.clear(self._index)
+            return
         self._array = []
         self._is_collapsed = False
         self._is_entanglement = False
@@ -49,18 +78,25 @@ class Tile:
         """
         Returns true if tile is in entanglement
         """
+        if self._engine is not None:
+            return self._engine.is_entangled(self._index)
         return self._is_entanglement
 
     def is_collapsed(self):
         """
         Returns true if tile is collapsed
         """
+        if self._engine is not None:
+            return self._engine.is_collapsed(self._index)
         return self._is_collapsed
 
     def set_collapsed(self, who):
         """
         Makes tile collapsed and write collapsed move to tile
         """
+        if self._engine is not None:
+            self._engine.set_collapsed(self._index, who)
+            return
         self._is_collapsed = True
         self._array = [who, who, who]
 
@@ -68,10 +104,16 @@ class Tile:
         """
         Makes tile to be or not in entanglement
         """
+        if self._engine is not None:
+            self._engine.set_entangled(self._index, entanglement)
+            return
         self._is_entanglement = entanglement
 
     def set_move_on_tile(self, who_move):
         """
         Add move to list of moves on choosen tile
         """
+        if self._engine is not None:
+            self._engine.place(self._index, who_move)
+            return
         self._array.append(who_move)
@@ -0,0 +1,64 @@
+from contextlib import contextmanager, nullcontext
+from threading import get_ident
+from time import perf_counter_ns
+import json
+import os
+
+FIRST_HALF = 'first half'
+SECOND_HALF = 'second half'
+BOT_MOVE = 'bot move'
+ENTANGLEMENT = 'entanglement'
+COLLAPSE = 'collapse'
+WIN_CHECK = 'win check'
+PHASES = (FIRST_HALF, SECOND_HALF, BOT_MOVE, ENTANGLEMENT, COLLAPSE, WIN_CHECK)
+
+
+class Tracer:
+    """
+    Records spans of game phases as Chrome trace events,
+    file made by write can be opened in Perfetto or chrome://tracing.
+    Every frontend names spans with the phases of PHASES.
+    :param events: recorded complete ('X') events
+    :type events: list
+    """
+    def __init__(self):
+        self.events = []
+        self._start = perf_counter_ns()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def span(self, name, **args):
+        """
+        Records time of code in with block as event named name
+        with args shown in trace viewer
+        """
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = perf_counter_ns()
+            self.events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self._start) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': self._pid,
+                'tid': get_ident(),
+                'args': args,
+            })
+
+    def write(self, path):
+        """
+        Writes events as Chrome trace JSON to path
+        """
+        with open(path, 'w') as handle:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, handle)
+
+
+def span(tracer, name, **args):
+    """
+    Returns span of tracer or empty context when tracer is None
+    """
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, **args)
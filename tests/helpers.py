@@ -0,0 +1,12 @@
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine, Y, parse_move
+
+
+def late_position():
+    engine = BoardEngine()
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(4, parse_move('y2'))
+    engine.set_collapsed(8, parse_move('x3'))
+    engine.set_collapsed(2, parse_move('y4'))
+    engine.set_collapsed(6, parse_move('x5'))
+    return Position(engine, Y, 6)
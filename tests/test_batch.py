@@ -0,0 +1,66 @@
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.game import Game
+from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.engine import PLAYERS, LINES
+import pytest
+
+np = pytest.importorskip('numpy')
+from quantum_tictactoe.batch import BatchEngine, DRAW, move_codes  # noqa: E402
+
+
+def replay(batch, index):
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    for number in range(1, batch.number + 1):
+        first, second = batch.pairs[index, number]
+        if first < 0:
+            break
+        board.tiles()[int(first)].set_move_on_tile(game.whos_move())
+        board.tiles()[int(second)].set_move_on_tile(game.whos_move())
+        game.set_last_tile(int(second))
+        game.set_last_move(game.whos_move())
+        game.increase_counter()
+        game.game_entanglement()
+        tile, move = batch.collapses[index, number]
+        assert game.entanglement == (tile >= 0)
+        if game.entanglement:
+            game.game_collapse(None, 'none', (int(tile), int(move)))
+            board.reset_entangl_tiles()
+    return board
+
+
+def test_move_codes():
+    assert list(move_codes([1, 2, 3])) == [2, 5, 6]
+
+
+def test_batch_run_finishes_all_games():
+    batch = BatchEngine(200, seed=1)
+    batch.run()
+    assert not batch.active().any()
+    assert set(batch.winner) <= {0, 1, DRAW}
+
+
+def test_batch_seed_is_reproducible():
+    first = BatchEngine(50, seed=3)
+    first.run()
+    second = BatchEngine(50, seed=3)
+    second.run()
+    assert (first.pairs == second.pairs).all()
+    assert (first.winner == second.winner).all()
+
+
+def test_batch_agrees_with_board():
+    batch = BatchEngine(300, seed=7)
+    batch.run()
+    for index in range(batch.games):
+        board = replay(batch, index)
+        assert list(board.engine().owner) == list(batch.owner[index])
+        winner, tiles = board.is_winner()
+        if batch.winner[index] == DRAW:
+            assert winner == 'unknown'
+        else:
+            assert winner == PLAYERS[batch.winner[index]]
+            assert tiles == list(LINES[batch.win_line[index]])
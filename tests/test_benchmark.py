@@ -0,0 +1,56 @@
+from quantum_tictactoe.benchmark import CORPORA, make_corpora, corpus_kind, run_benchmarks
+from quantum_tictactoe.benchmark import compare, main, load_game, _uncached_board
+from quantum_tictactoe.record import new_game
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine
+import json
+
+
+def test_make_corpora_is_seeded():
+    corpora = make_corpora(5, seed=1)
+    assert set(corpora) == set(CORPORA)
+    assert all(len(corpus) == 5 for corpus in corpora.values())
+    assert corpora == make_corpora(5, seed=1)
+    for name, corpus in corpora.items():
+        for packed in corpus:
+            assert corpus_kind(Position.unpack(packed)) == name
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(size=3, repeat=1, games=5)
+    assert results['board_collapse']['calls'] == 3
+    assert results['board_show_board']['calls'] == 12
+    assert results['games_per_second'] > 0
+
+
+def test_is_winner_benchmark_is_not_cached(monkeypatch):
+    packed = make_corpora(1, seed=2)['near_end'][0]
+    game = load_game(new_game(), packed)
+    expected = game.board.is_winner()
+    calls = []
+    winning_lines = BoardEngine.winning_lines
+    monkeypatch.setattr(BoardEngine, 'winning_lines',
+                        lambda engine: calls.append(1) or winning_lines(engine))
+    board = _uncached_board(game)
+    assert board.is_winner() == expected
+    assert len(calls) == 1
+
+
+def test_compare():
+    baseline = {'board_collapse': {'per_call_us': 10.0}, 'games_per_second': 100.0}
+    assert compare({'board_collapse': {'per_call_us': 11.0}, 'games_per_second': 90.0},
+                   baseline) == []
+    assert compare({'board_collapse': {'per_call_us': 13.0}, 'games_per_second': 70.0},
+                   baseline) == [('board_collapse', 13.0, 10.0), ('games_per_second', 70.0, 100.0)]
+
+
+def test_main_with_baseline(tmp_path):
+    output = str(tmp_path / 'results.json')
+    assert main(['--size', '2', '--repeat', '1', '--games', '2', '--output', output]) == 0
+    with open(output) as handle:
+        results = json.load(handle)
+    results['board_collapse']['per_call_us'] = 0.0
+    baseline = str(tmp_path / 'baseline.json')
+    with open(baseline, 'w') as handle:
+        json.dump(results, handle)
+    assert main(['--size', '2', '--repeat', '1', '--games', '2', '--baseline', baseline]) == 1
@@ -1,5 +1,6 @@
 from quantum_tictactoe.board import Board, InvalidCollapseError
 from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.engine import parse_move
 import pytest
 
 
@@ -41,9 +42,9 @@ def test_could_collapse():
     board = Board(tiles)
     board.add_entangl_tile(1)
     board.add_entangl_tile(2)
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    assert board.could_collapse(1, 'x1') is True
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    assert board.could_collapse(1, parse_move('x1')) is True
 
 
 def test_could_collapse_error():
@@ -52,7 +53,7 @@ def test_could_collapse_error():
         tiles.append(Tile())
     board = Board(tiles)
     with pytest.raises(InvalidCollapseError):
-        board.could_collapse(1, 'x1')
+        board.could_collapse(1, parse_move('x1'))
 
 
 def test_collapse():
@@ -62,11 +63,11 @@ def test_collapse():
     board = Board(tiles)
     board.add_entangl_tile(1)
     board.add_entangl_tile(2)
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('y2')
-    board.tiles()[2].set_move_on_tile('y2')
-    board.collapse(1, 'x1')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('y2'))
+    board.tiles()[2].set_move_on_tile(parse_move('y2'))
+    assert board.collapse(1, parse_move('x1')) == [(1, parse_move('x1')), (2, parse_move('y2'))]
     assert board.tiles()[1].is_collapsed() is True
     assert board.tiles()[2].is_collapsed() is True
 
@@ -78,13 +79,13 @@ def test_collapse_error():
     board = Board(tiles)
     board.add_entangl_tile(1)
     board.add_entangl_tile(2)
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('x3')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('y2')
-    board.tiles()[2].set_move_on_tile('y2')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('x3'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('y2'))
+    board.tiles()[2].set_move_on_tile(parse_move('y2'))
     with pytest.raises(InvalidCollapseError):
-        board.collapse(1, 'x3')
+        board.collapse(1, parse_move('x3'))
 
 
 def test_analyse_board():
@@ -94,12 +95,12 @@ def test_analyse_board():
     board = Board(tiles)
     board.add_entangl_tile(1)
     board.add_entangl_tile(2)
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('y2')
-    board.tiles()[2].set_move_on_tile('y2')
-    board.collapse(1, 'x1')
-    assert board.analyse_board() == ['-', 'x1', 'y2', '-', '-', '-', '-', '-', '-']
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('y2'))
+    board.tiles()[2].set_move_on_tile(parse_move('y2'))
+    board.collapse(1, parse_move('x1'))
+    assert board.analyse_board() == [None, parse_move('x1'), parse_move('y2'), None, None, None, None, None, None]
 
 
 def test_analyse_board_empty():
@@ -107,7 +108,7 @@ def test_analyse_board_empty():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    assert board.analyse_board() == ['-', '-', '-', '-', '-', '-', '-', '-', '-']
+    assert board.analyse_board() == [None, None, None, None, None, None, None, None, None]
 
 
 def test_win_option_no_winner():
@@ -115,7 +116,7 @@ def test_win_option_no_winner():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    coll_moves = ['x1', 'x3', 'y2', '-', '-', '-', '-', '-', '-']
+    coll_moves = [parse_move('x1'), parse_move('x3'), parse_move('y2'), None, None, None, None, None, None]
     assert board.win_options(coll_moves) == ([], [])
 
 
@@ -124,8 +125,8 @@ def test_win_option_some_winners():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    coll_moves = ['x3', 'x1', 'x5', 'y2', '-', 'y4', 'y6', 'x7', 'y8']
-    assert board.win_options(coll_moves) == (['x1'], [[0, 1, 2]])
+    coll_moves = [parse_move('x3'), parse_move('x1'), parse_move('x5'), parse_move('y2'), None, parse_move('y4'), parse_move('y6'), parse_move('x7'), parse_move('y8')]
+    assert board.win_options(coll_moves) == ([parse_move('x1')], [[0, 1, 2]])
 
 
 def test_is_winner_no_end():
@@ -133,7 +134,7 @@ def test_is_winner_no_end():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    board.tiles()[0].set_collapsed('x1')
+    board.tiles()[0].set_collapsed(parse_move('x1'))
     assert board.is_winner() == (None, [])
 
 
@@ -142,9 +143,9 @@ def test_is_winner_one_option():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    board.tiles()[0].set_collapsed('x1')
-    board.tiles()[1].set_collapsed('x3')
-    board.tiles()[2].set_collapsed('x5')
+    board.tiles()[0].set_collapsed(parse_move('x1'))
+    board.tiles()[1].set_collapsed(parse_move('x3'))
+    board.tiles()[2].set_collapsed(parse_move('x5'))
     assert board.is_winner() == ('x', [0, 1, 2])
 
 
@@ -153,10 +154,91 @@ def test_is_winner_more_options():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    board.tiles()[0].set_collapsed('x7')
-    board.tiles()[1].set_collapsed('x3')
-    board.tiles()[2].set_collapsed('x5')
-    board.tiles()[3].set_collapsed('y2')
-    board.tiles()[4].set_collapsed('y4')
-    board.tiles()[5].set_collapsed('y6')
+    board.tiles()[0].set_collapsed(parse_move('x7'))
+    board.tiles()[1].set_collapsed(parse_move('x3'))
+    board.tiles()[2].set_collapsed(parse_move('x5'))
+    board.tiles()[3].set_collapsed(parse_move('y2'))
+    board.tiles()[4].set_collapsed(parse_move('y4'))
+    board.tiles()[5].set_collapsed(parse_move('y6'))
     assert board.is_winner() == ('y', [3, 4, 5])
+
+
+def test_tiles_with_move():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[5].set_move_on_tile(parse_move('x1'))
+    assert board.tiles_with_move(parse_move('x1')) == (1, 5)
+    board.tiles()[1].remove_move(parse_move('x1'))
+    assert board.tiles_with_move(parse_move('x1')) == (5,)
+    board.tiles()[5].set_collapsed(parse_move('y2'))
+    assert board.tiles_with_move(parse_move('x1')) == ()
+    board.tiles()[3].set_move_on_tile(parse_move('x3'))
+    board.tiles()[3].clear_tile()
+    assert board.tiles_with_move(parse_move('x3')) == ()
+
+
+def test_is_winner_two_digit_rounds():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    for tile, move in enumerate(['x5', 'x9', 'x1', 'y8', 'y10', 'y6']):
+        board.tiles()[tile].set_collapsed(parse_move(move))
+    assert board.is_winner() == ('x', [0, 1, 2])
+
+
+def test_win_subscript():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    assert board.win_subscript() is None
+    board.tiles()[2].set_collapsed(parse_move('x7'))
+    board.tiles()[4].set_collapsed(parse_move('x3'))
+    board.tiles()[6].set_collapsed(parse_move('x5'))
+    assert board.win_subscript() == 3
+
+
+def test_collapse_options():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('y2'))
+    board.tiles()[3].set_move_on_tile(parse_move('y2'))
+    board.tiles()[1].set_move_on_tile(parse_move('x3'))
+    board.tiles()[3].set_move_on_tile(parse_move('x3'))
+    board.tiles()[4].set_move_on_tile(parse_move('y4'))
+    board.tiles()[5].set_move_on_tile(parse_move('y4'))
+    for tile in board.cycle_component(parse_move('x3')):
+        board.add_entangl_tile(tile)
+    assert board.collapse_options() == [(1, parse_move('x1')), (1, parse_move('x3')),
+                                        (2, parse_move('x1')), (2, parse_move('y2')),
+                                        (3, parse_move('y2')), (3, parse_move('x3'))]
+    assert board.could_collapse(3, parse_move('x1')) is False
+    assert board.engine().is_collapse_option(3, parse_move('x3')) is True
+    assert board.engine().is_collapse_option(4, parse_move('y4')) is False
+
+
+def test_collapse_preview():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('y2'))
+    board.tiles()[2].set_move_on_tile(parse_move('y2'))
+    board.add_entangl_tile(1)
+    board.add_entangl_tile(2)
+    preview = board.collapse_preview(1, parse_move('x1'))
+    assert preview == [None, parse_move('x1'), parse_move('y2')] + [None] * 6
+    assert board.tiles()[1].is_collapsed() is False
+    board.collapse(1, parse_move('x1'))
+    assert board.analyse_board() == preview
+    assert board.collapse_options() == []
@@ -0,0 +1,61 @@
+from quantum_tictactoe.book import OpeningBook, BookError, build_book, write_book, read_book
+from quantum_tictactoe.symmetry import TRANSFORMS, transform_position
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.game import Game
+from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.bot import Bot
+import pytest
+
+
+def test_build_book():
+    entries = build_book(plies=2, depth=1)
+    assert len(entries) == 9
+
+
+def test_write_and_read_book(tmp_path):
+    path = str(tmp_path / 'book')
+    write_book(path, {2 ** 64 - 1: (0, 4), 3: (2, 9)})
+    assert read_book(path) == {2 ** 64 - 1: (0, 4), 3: (2, 9)}
+
+
+def test_read_wrong_book(tmp_path):
+    path = tmp_path / 'book'
+    path.write_bytes(b'0' * 32)
+    with pytest.raises(BookError):
+        read_book(str(path))
+
+
+def test_book_action_in_symmetric_positions(tmp_path):
+    path = str(tmp_path / 'book')
+    write_book(path, build_book(plies=2, depth=1))
+    book = OpeningBook(path)
+    position = Position(BoardEngine())
+    position.play(0, 5)
+    for transform in range(len(TRANSFORMS)):
+        moved = transform_position(position, transform)
+        assert book.action(moved) in moved.pair_moves()
+    position.play(1, 2)
+    assert book.action(position) is None
+    assert len(book) == 9
+
+
+def test_book_is_loaded_lazily(tmp_path):
+    book = OpeningBook(str(tmp_path / 'missing'))
+    with pytest.raises(FileNotFoundError):
+        book.action(Position(BoardEngine()))
+
+
+def test_bot_uses_book(tmp_path):
+    path = str(tmp_path / 'book')
+    write_book(path, build_book(plies=1, depth=1))
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    bot = Bot('hard', board, game, book=OpeningBook(path))
+    first, second = bot.move()
+    assert board.tiles()[first].array() == board.tiles()[second].array() == [game.whos_move()]
+    assert bot.search_stats()['nodes'] == 0
@@ -1,7 +1,9 @@
+from random import Random
 from quantum_tictactoe.bot import Bot, BotTypeError
 from quantum_tictactoe.board import Board
 from quantum_tictactoe.tile import Tile
 from quantum_tictactoe.game import Game
+from quantum_tictactoe.engine import parse_move
 import pytest
 
 
@@ -58,15 +60,92 @@ def test_bot_collapse(monkeypatch):
         tiles.append(Tile())
     board = Board(tiles)
     game = Game(board)
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('x3')
-    board.tiles()[2].set_move_on_tile('x3')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('x3'))
+    board.tiles()[2].set_move_on_tile(parse_move('x3'))
     board.add_entangl_tile(1)
     board.add_entangl_tile(2)
     bot = Bot('easy', board, game)
 
-    def one(a):
-        return 1
-    monkeypatch.setattr('quantum_tictactoe.bot.choice', one)
-    assert bot.collapse() == '1,x3'
+    def second(options):
+        return options[1]
+    monkeypatch.setattr('quantum_tictactoe.bot.choice', second)
+    assert bot.collapse() == (1, parse_move('x3'))
+
+
+def test_bot_hard_move():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    game.set_last_move(parse_move('x1'))
+    bot = Bot('hard', board, game, depth=1)
+    first, second = bot.move()
+    assert board.tiles()[first].array() == [parse_move('y1')]
+    assert board.tiles()[second].array() == [parse_move('y1')]
+    assert bot.search_stats()['nodes'] == 36
+
+
+def test_bot_hard_collapse():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    board.tiles()[0].set_collapsed(parse_move('y2'))
+    board.tiles()[1].set_collapsed(parse_move('y4'))
+    board.tiles()[2].set_move_on_tile(parse_move('y6'))
+    board.tiles()[5].set_move_on_tile(parse_move('y6'))
+    board.tiles()[2].set_move_on_tile(parse_move('x7'))
+    board.tiles()[5].set_move_on_tile(parse_move('x7'))
+    game.set_last_move(parse_move('x7'))
+    game.increase_counter()
+    game.game_entanglement()
+    bot = Bot('hard', board, game)
+    tile, move = bot.collapse()
+    board.collapse(tile, move)
+    assert board.is_winner()[0] == 'y'
+
+
+def test_bot_mcts_move():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    game.set_last_move(parse_move('x1'))
+    bot = Bot('mcts', board, game, iterations=50)
+    first, second = bot.move()
+    assert board.tiles()[first].array() == [parse_move('y1')]
+    assert board.tiles()[second].array() == [parse_move('y1')]
+    assert bot.search_stats()['iterations'] == 50
+
+
+def test_bot_close_stops_workers():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    game.set_last_move(parse_move('x1'))
+    bot = Bot('mcts', board, game, iterations=20, workers=2, rng=Random(1))
+    bot.move()
+    assert bot._search._pool is not None
+    bot.close()
+    assert bot._search._pool is None
+    bot.close()
+
+
+def test_bot_rng():
+    moves = []
+    for _ in range(2):
+        tiles = []
+        for _ in range(9):
+            tiles.append(Tile())
+        board = Board(tiles)
+        game = Game(board)
+        bot = Bot('easy', board, game, rng=Random(11))
+        moves.append(bot.move())
+    assert moves[0] == moves[1]
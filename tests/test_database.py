@@ -0,0 +1,84 @@
+from quantum_tictactoe.database import PositionDatabase, DatabaseError, write_database, main
+from quantum_tictactoe.solver import Solver, DRAW, save_memo
+from quantum_tictactoe.symmetry import canonical_key
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.game import Game
+from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.bot import Bot
+from tests.helpers import late_position
+import pytest
+
+
+def test_database_get(tmp_path):
+    path = str(tmp_path / 'positions.db')
+    write_database(path, {7: 1, 3: -1, 2 ** 64 - 1: 0})
+    database = PositionDatabase(path)
+    assert len(database) == 3
+    assert database.get(3) == -1
+    assert database.get(7) == 1
+    assert database.get(2 ** 64 - 1) == 0
+    assert database.get(5) is None
+    assert 7 in database
+    database.close()
+
+
+def test_database_wrong_file(tmp_path):
+    path = tmp_path / 'wrong.db'
+    path.write_bytes(b'0' * 32)
+    with pytest.raises(DatabaseError):
+        PositionDatabase(str(path))
+
+
+def test_database_best_action(tmp_path):
+    solver = Solver()
+    solver.solve(late_position())
+    path = str(tmp_path / 'positions.db')
+    write_database(path, solver.memo())
+    database = PositionDatabase(path)
+    assert database.value(late_position()) == DRAW
+    action = database.best_action(late_position())
+    assert action == solver.best_action(late_position())[0]
+    assert database.best_action(Position(BoardEngine())) is None
+
+
+def test_database_main(tmp_path):
+    memo = str(tmp_path / 'memo')
+    save_memo(memo, {4: 1})
+    path = str(tmp_path / 'positions.db')
+    main([path, memo])
+    assert PositionDatabase(path).get(4) == 1
+
+
+def test_bot_uses_database(tmp_path):
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    game.make_move(0, 1)
+    position = Position.from_game(game)
+    child = position.copy()
+    child.play(2, 3)
+    path = str(tmp_path / 'positions.db')
+    write_database(path, {canonical_key(child)[0]: -1})
+    bot = Bot('hard', board, game, depth=1, database=PositionDatabase(path))
+    assert bot.move() == (2, 3)
+    assert bot.search_stats()['nodes'] == 0
+
+
+def test_database_best_action_not_sure(tmp_path):
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    game = Game(Board(tiles))
+    game.make_move(0, 1)
+    position = Position.from_game(game)
+    child = position.copy()
+    child.play(2, 3)
+    path = str(tmp_path / 'positions.db')
+    write_database(path, {canonical_key(child)[0]: 1})
+    assert PositionDatabase(path).best_action(position) is None
+    write_database(path, {canonical_key(child)[0]: 1, canonical_key(position)[0]: -1})
+    assert PositionDatabase(path).best_action(position) == (2, 3)
@@ -0,0 +1,147 @@
+from quantum_tictactoe.engine import BoardEngine, X, Y
+from quantum_tictactoe.engine import make_move, parse_move, format_move
+
+
+def test_move_encoding():
+    move = make_move(Y, 12)
+    assert parse_move('y12') == move
+    assert format_move(move) == 'y12'
+    assert format_move(parse_move('x3')) == 'x3'
+
+
+def test_engine_place_and_remove():
+    engine = BoardEngine()
+    engine.place(1, parse_move('x1'))
+    engine.place(1, parse_move('y2'))
+    assert engine.moves(1) == [parse_move('x1'), parse_move('y2')]
+    assert engine.has_move(1, parse_move('x1')) is True
+    engine.remove(1, parse_move('x1'))
+    assert engine.has_move(1, parse_move('x1')) is False
+
+
+def test_engine_collapsed():
+    engine = BoardEngine()
+    engine.place(4, parse_move('x1'))
+    engine.set_collapsed(4, parse_move('x1'))
+    assert engine.is_collapsed(4) is True
+    assert engine.moves(4) == [parse_move('x1')] * 3
+    assert engine.classical[X] == 1 << 4
+    assert engine.not_collapsed() == 8
+    engine.clear(4)
+    assert engine.is_collapsed(4) is False
+    assert engine.classical[X] == 0
+
+
+def test_engine_winner_by_lowest_subscript():
+    engine = BoardEngine()
+    for tile, move in enumerate(['x5', 'x9', 'x1', 'y8', 'y10', 'y6']):
+        engine.set_collapsed(tile, parse_move(move))
+    assert engine.winner() == (X, [0, 1, 2])
+
+
+def test_engine_draw():
+    engine = BoardEngine()
+    moves = ['x1', 'y2', 'x3', 'x5', 'y4', 'y6', 'y8', 'x7']
+    for tile, move in enumerate(moves):
+        engine.set_collapsed(tile, parse_move(move))
+    assert engine.winner() == ('unknown', [])
+
+
+def test_engine_cycle_component():
+    engine = BoardEngine()
+    for tile, move in [(0, 'x1'), (1, 'x1'), (1, 'y2'), (2, 'y2'), (5, 'x3'), (6, 'x3')]:
+        engine.place(tile, parse_move(move))
+    assert engine.cycle == -1
+    engine.place(2, parse_move('y4'))
+    engine.place(0, parse_move('y4'))
+    assert engine.cycle == parse_move('y4')
+    assert engine.cycle_component(parse_move('y4')) == 0b111
+    assert engine.cycle_component(parse_move('y2')) == 0
+
+
+def test_engine_cycle_after_collapse():
+    engine = BoardEngine()
+    for tile, move in [(0, 'x1'), (1, 'x1'), (0, 'y2'), (1, 'y2')]:
+        engine.place(tile, parse_move(move))
+    assert engine.cycle == parse_move('y2')
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(1, parse_move('y2'))
+    engine.place(2, parse_move('x3'))
+    engine.place(3, parse_move('x3'))
+    assert engine.cycle == -1
+
+
+def test_engine_ends():
+    engine = BoardEngine()
+    engine.place(3, parse_move('x1'))
+    engine.place(7, parse_move('x1'))
+    assert engine.ends == {parse_move('x1'): (3, 7)}
+    engine.set_collapsed(3, parse_move('y2'))
+    assert engine.ends == {parse_move('x1'): (7,)}
+    engine.clear(7)
+    assert engine.ends == {}
+
+
+def test_engine_collapse_tail():
+    engine = BoardEngine()
+    marks = [(0, 'x1'), (1, 'x1'), (1, 'y2'), (2, 'y2'),
+             (2, 'x3'), (0, 'x3'), (2, 'y4'), (8, 'y4')]
+    for tile, move in marks:
+        engine.place(tile, parse_move(move))
+    changed = engine.collapse(0, parse_move('x3'))
+    assert changed == [(0, parse_move('x3')), (1, parse_move('x1')),
+                       (2, parse_move('y2')), (8, parse_move('y4'))]
+    assert engine.ends == {}
+
+
+def test_engine_result_cached_until_collapse():
+    engine = BoardEngine()
+    for tile, move in [(3, 'y2'), (4, 'y4'), (5, 'y6')]:
+        engine.set_collapsed(tile, parse_move(move))
+    result = engine.result()
+    assert result == (Y, [3, 4, 5], 2)
+    assert engine.result() is result
+    engine.clear_result()
+    assert engine.result() is not result
+    assert engine.result() == result
+    result = engine.result()
+    engine.set_collapsed(0, parse_move('x1'))
+    assert engine.result() is not result
+    engine.clear(4)
+    assert engine.result() == (None, [], None)
+
+
+def test_engine_zobrist_is_incremental():
+    engine = BoardEngine()
+    engine.place(1, parse_move('x1'))
+    engine.place(2, parse_move('x1'))
+    engine.place(2, parse_move('y2'))
+    engine.place(3, parse_move('y2'))
+    other = BoardEngine()
+    other.place(3, parse_move('y2'))
+    other.place(2, parse_move('x1'))
+    other.place(2, parse_move('y2'))
+    other.place(1, parse_move('x1'))
+    assert engine.zobrist == other.zobrist
+    engine.collapse(1, parse_move('x1'))
+    rebuilt = BoardEngine.from_marks(engine.spooky, engine.owner)
+    assert engine.zobrist == rebuilt.zobrist
+    other.remove(1, parse_move('x1'))
+    assert engine.zobrist != other.zobrist
+
+
+def test_engine_save_and_restore():
+    engine = BoardEngine()
+    engine.place(1, parse_move('x1'))
+    engine.place(2, parse_move('x1'))
+    engine.place(1, parse_move('y2'))
+    engine.place(2, parse_move('y2'))
+    engine.entangled = 0b110
+    zobrist = engine.zobrist
+    delta = engine.save(engine.entangled)
+    engine.collapse(1, parse_move('x1'))
+    assert engine.zobrist != zobrist
+    engine.restore(delta)
+    assert engine.zobrist == zobrist
+    assert engine.moves(1) == [parse_move('x1'), parse_move('y2')]
+    assert engine.ends[parse_move('y2')] == (1, 2)
@@ -1,7 +1,10 @@
 from quantum_tictactoe.game import Game, InvalidMoveError
-from quantum_tictactoe.board import Board
+from quantum_tictactoe.board import Board, InvalidCollapseError
 from quantum_tictactoe.tile import Tile
 from quantum_tictactoe.bot import Bot
+from quantum_tictactoe.engine import parse_move
+from quantum_tictactoe.position import Position
+from random import Random
 import pytest
 
 
@@ -16,7 +19,7 @@ def test_game_create():
     assert game.basic is True
     assert game.is_first_move() is True
     assert game.last_tile() == ''
-    assert game.last_move() == ''
+    assert game.last_move() is None
     assert game.is_finished() is False
     assert game.game_result() == ''
     assert game.counter() == 1
@@ -32,8 +35,8 @@ def test_game_making_changes():
     assert game.is_first_move() is False
     game.set_last_tile(2)
     assert game.last_tile() == 2
-    game.set_last_move('x1')
-    assert game.last_move() == 'x1'
+    game.set_last_move(parse_move('x1'))
+    assert game.last_move() == parse_move('x1')
     game.set_finished()
     assert game.is_finished() is True
     game.increase_counter()
@@ -48,13 +51,13 @@ def test_game_clear():
     game = Game(board)
     game.set_first_move(False)
     game.set_last_tile(2)
-    game.set_last_move('x1')
+    game.set_last_move(parse_move('x1'))
     game.set_finished()
     game.increase_counter()
     game.clear_game()
     assert game.is_first_move() is True
     assert game.last_tile() == ''
-    assert game.last_move() == ''
+    assert game.last_move() is None
     assert game.is_finished() is False
     assert game.game_result() == ''
     assert game.counter() == 1
@@ -91,7 +94,7 @@ def test_move_is_not_correct_collapsed_tile():
     board = Board(tiles)
     game = Game(board)
     tile = game.board.tiles()[1]
-    tile.set_collapsed('x1')
+    tile.set_collapsed(parse_move('x1'))
     assert game.move_is_correct(tile, 1) is False
 
 
@@ -101,9 +104,9 @@ def test_whos_move_x():
         tiles.append(Tile())
     board = Board(tiles)
     game = Game(board)
-    game.set_last_move('y1')
+    game.set_last_move(parse_move('y1'))
     game.increase_counter()
-    assert game.whos_move() == 'x2'
+    assert game.whos_move() == parse_move('x2')
 
 
 def test_whos_move_y():
@@ -112,9 +115,9 @@ def test_whos_move_y():
         tiles.append(Tile())
     board = Board(tiles)
     game = Game(board)
-    game.set_last_move('x1')
+    game.set_last_move(parse_move('x1'))
     game.increase_counter()
-    assert game.whos_move() == 'y2'
+    assert game.whos_move() == parse_move('y2')
 
 
 def test_move_correct():
@@ -143,13 +146,14 @@ def test_is_entanglement():
         tiles.append(Tile())
     board = Board(tiles)
     game = Game(board)
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('x3')
-    board.tiles()[2].set_move_on_tile('x3')
-    game.set_last_move('x3')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('x3'))
+    board.tiles()[2].set_move_on_tile(parse_move('x3'))
+    game.set_last_move(parse_move('x3'))
     game.set_last_tile(2)
     assert game.is_entanglement() is True
+    assert board.entangl_tiles() == [1, 2]
 
 
 def test_is_not_entanglement():
@@ -158,15 +162,33 @@ def test_is_not_entanglement():
         tiles.append(Tile())
     board = Board(tiles)
     game = Game(board)
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('x3')
-    board.tiles()[3].set_move_on_tile('x3')
-    game.set_last_move('x3')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('x3'))
+    board.tiles()[3].set_move_on_tile(parse_move('x3'))
+    game.set_last_move(parse_move('x3'))
     game.set_last_tile(1)
     assert game.is_entanglement() is False
 
 
+def test_is_entanglement_with_tail():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    board.tiles()[4].set_move_on_tile(parse_move('x1'))
+    board.tiles()[5].set_move_on_tile(parse_move('x1'))
+    board.tiles()[0].set_move_on_tile(parse_move('y2'))
+    board.tiles()[4].set_move_on_tile(parse_move('y2'))
+    board.tiles()[0].set_move_on_tile(parse_move('x3'))
+    board.tiles()[5].set_move_on_tile(parse_move('x3'))
+    game.set_last_move(parse_move('x3'))
+    game.set_last_tile(5)
+    assert game.is_entanglement() is True
+    assert board.entangl_tiles() == [0, 4, 5]
+
+
 def test_game_entanglement():
     tiles = []
     for _ in range(9):
@@ -175,11 +197,11 @@ def test_game_entanglement():
     game = Game(board)
     assert game.entanglement is False
     assert game.basic is True
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('x3')
-    board.tiles()[2].set_move_on_tile('x3')
-    game.set_last_move('x3')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('x3'))
+    board.tiles()[2].set_move_on_tile(parse_move('x3'))
+    game.set_last_move(parse_move('x3'))
     game.set_last_tile(2)
     game.game_entanglement()
     assert game.entanglement is True
@@ -195,17 +217,39 @@ def test_game_collapse_player():
     bot = Bot('easy', board, game)
     assert board.tiles()[1].is_collapsed() is False
     assert board.tiles()[2].is_collapsed() is False
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('y2')
-    board.tiles()[2].set_move_on_tile('y2')
-    game.set_last_move('y2')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('y2'))
+    board.tiles()[2].set_move_on_tile(parse_move('y2'))
+    game.set_last_move(parse_move('y2'))
     game.set_last_tile(2)
     collapse = '1,x1'
     game.game_entanglement()
-    game.game_collapse(bot, 'easy', collapse)
+    changed = game.game_collapse(bot, 'easy', collapse)
     assert board.tiles()[1].is_collapsed() is True
     assert board.tiles()[2].is_collapsed() is True
+    assert sorted(changed) == [(1, parse_move('x1')), (2, parse_move('y2'))]
+
+
+def test_game_collapse_wrong_input():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    bot = Bot('easy', board, game)
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('y2'))
+    board.tiles()[2].set_move_on_tile(parse_move('y2'))
+    game.set_last_move(parse_move('y2'))
+    game.set_last_tile(2)
+    game.game_entanglement()
+    for collapse in ['1,z1', '0,X1', '0,x', '1,', '1', 'a,x1', '-1,x1', '9,x1']:
+        with pytest.raises(InvalidCollapseError):
+            game.game_collapse(bot, 'none', collapse)
+    assert board.tiles()[1].is_collapsed() is False
+    assert board.tiles()[2].is_collapsed() is False
 
 
 def test_game_collapse_bot():
@@ -217,11 +261,11 @@ def test_game_collapse_bot():
     bot = Bot('easy', board, game)
     assert board.tiles()[1].is_collapsed() is False
     assert board.tiles()[2].is_collapsed() is False
-    board.tiles()[1].set_move_on_tile('x1')
-    board.tiles()[2].set_move_on_tile('x1')
-    board.tiles()[1].set_move_on_tile('x3')
-    board.tiles()[2].set_move_on_tile('x3')
-    game.set_last_move('x3')
+    board.tiles()[1].set_move_on_tile(parse_move('x1'))
+    board.tiles()[2].set_move_on_tile(parse_move('x1'))
+    board.tiles()[1].set_move_on_tile(parse_move('x3'))
+    board.tiles()[2].set_move_on_tile(parse_move('x3'))
+    game.set_last_move(parse_move('x3'))
     game.set_last_tile(2)
     game.game_entanglement()
     game.game_collapse(bot, 'easy')
@@ -234,9 +278,9 @@ def test_is_game_end():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    board.tiles()[0].set_collapsed('x1')
-    board.tiles()[1].set_collapsed('x3')
-    board.tiles()[2].set_collapsed('x5')
+    board.tiles()[0].set_collapsed(parse_move('x1'))
+    board.tiles()[1].set_collapsed(parse_move('x3'))
+    board.tiles()[2].set_collapsed(parse_move('x5'))
     game = Game(board)
     assert game.is_game_end() is True
 
@@ -246,12 +290,12 @@ def test_is_game_end_more_options():
     for _ in range(9):
         tiles.append(Tile())
     board = Board(tiles)
-    board.tiles()[0].set_collapsed('x7')
-    board.tiles()[1].set_collapsed('x3')
-    board.tiles()[2].set_collapsed('x5')
-    board.tiles()[3].set_collapsed('y2')
-    board.tiles()[4].set_collapsed('y4')
-    board.tiles()[5].set_collapsed('y6')
+    board.tiles()[0].set_collapsed(parse_move('x7'))
+    board.tiles()[1].set_collapsed(parse_move('x3'))
+    board.tiles()[2].set_collapsed(parse_move('x5'))
+    board.tiles()[3].set_collapsed(parse_move('y2'))
+    board.tiles()[4].set_collapsed(parse_move('y4'))
+    board.tiles()[5].set_collapsed(parse_move('y6'))
     game = Game(board)
     assert game.is_game_end() is True
 
@@ -263,3 +307,139 @@ def test_is_not_game_end():
     board = Board(tiles)
     game = Game(board)
     assert game.is_game_end() is False
+
+
+def snapshot(game):
+    engine = game.board.engine()
+    return (list(engine.spooky), list(engine.owner), engine.entangled, dict(engine.ends),
+            game.entanglement, game.is_first_move(), game.last_tile(), game.last_move(),
+            game.is_finished(), game.game_result(), game.counter())
+
+
+def test_legal_moves():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    assert len(list(game.legal_moves())) == 36
+    board.tiles()[4].set_collapsed(parse_move('x1'))
+    assert (0, 4) not in list(game.legal_moves())
+    game.move(0)
+    game.set_first_move(False)
+    assert list(game.legal_moves()) == [(0, 1), (0, 2), (0, 3), (0, 5), (0, 6), (0, 7), (0, 8)]
+    assert board.tiles()[1].array() == []
+
+
+def test_make_move_and_unmake():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    start = snapshot(game)
+    assert game.make_move(1, 2) is False
+    assert board.tiles()[1].array() == [parse_move('x1')]
+    assert game.last_move() == parse_move('x1')
+    assert game.make_move(1, 2) is True
+    assert list(game.collapse_options()) == [(1, parse_move('x1')), (1, parse_move('y2')),
+                                             (2, parse_move('x1')), (2, parse_move('y2'))]
+    assert list(game.legal_moves()) == []
+    game.make_collapse(1, parse_move('x1'))
+    assert board.tiles()[2].is_collapsed() is True
+    game.unmake()
+    game.unmake()
+    game.unmake()
+    assert snapshot(game) == start
+
+
+def test_make_move_wrong():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    with pytest.raises(InvalidMoveError):
+        game.make_move(1, 1)
+    with pytest.raises(InvalidMoveError):
+        game.make_move(1, 9)
+    assert board.tiles()[1].array() == []
+
+
+def test_make_unmake_random_games():
+    rng = Random(4)
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    game = Game(Board(tiles))
+    for _ in range(30):
+        history = [snapshot(game)]
+        while not game.is_finished():
+            if game.entanglement:
+                game.make_collapse(*rng.choice(list(game.collapse_options())))
+            else:
+                game.make_move(*rng.choice(list(game.legal_moves())))
+            history.append(snapshot(game))
+        history.pop()
+        while history:
+            game.unmake()
+            assert snapshot(game) == history.pop()
+
+
+def test_collapse_options_only_on_cycle():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    game.make_move(0, 1)
+    game.make_move(1, 5)
+    game.make_move(1, 2)
+    game.make_move(2, 0)
+    options = list(game.collapse_options())
+    assert (5, parse_move('y2')) not in options
+    assert (1, parse_move('y2')) not in options
+    component = board.entangl_tiles()
+    assert 5 in component
+    for tile, move in options:
+        game.make_collapse(tile, move)
+        for index in component:
+            assert board.tiles()[index].is_collapsed() is True
+        assert all(not mask for mask in board.engine().spooky)
+        game.unmake()
+
+
+def test_random_collapses_leave_no_spooky_marks():
+    rng = Random(5)
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    game = Game(Board(tiles))
+    engine = game.board.engine()
+    for _ in range(100):
+        game.clear_game()
+        while not game.is_finished():
+            if game.entanglement:
+                component = game.board.entangl_tiles()
+                game.make_collapse(*rng.choice(list(game.collapse_options())))
+                assert all(not engine.spooky[tile] for tile in component)
+            else:
+                game.make_move(*rng.choice(list(game.legal_moves())))
+
+
+def test_game_key():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    game = Game(Board(tiles))
+    start = game.key()
+    game.make_move(1, 2)
+    game.make_move(3, 4)
+    assert game.key() == Position.from_game(game).key()
+    game.unmake()
+    game.unmake()
+    assert game.key() == start
+    game.move(1)
+    game.set_first_move(False)
+    assert game.key() == Position.from_game(game).key()
+    assert game.key() != start
@@ -0,0 +1,62 @@
+from quantum_tictactoe import instrument
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.game import Game
+from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.simulate import run_batch
+
+
+def test_instrument_is_opt_in():
+    original = Board.is_winner
+    instrument.enable()
+    try:
+        assert instrument.is_enabled() is True
+        assert Board.is_winner is not original
+    finally:
+        instrument.disable()
+    assert instrument.is_enabled() is False
+    assert Board.is_winner is original
+
+
+def test_instrument_snapshot():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    instrument.reset()
+    instrument.enable([(Board, 'is_winner'), (Game, 'is_game_end')])
+    try:
+        game.is_game_end()
+        board.is_winner()
+    finally:
+        instrument.disable()
+    board.is_winner()
+    stats = instrument.snapshot()
+    assert stats['Board.is_winner']['calls'] == 2
+    assert stats['Board.is_winner']['max_depth'] == 1
+    assert stats['Game.is_game_end']['calls'] == 1
+    instrument.reset()
+    assert instrument.snapshot() == {}
+
+
+def test_instrument_nested_depth():
+    class Counter:
+        def count(self, number):
+            return 0 if number == 0 else 1 + self.count(number - 1)
+    instrument.reset()
+    instrument.enable([(Counter, 'count')])
+    try:
+        assert Counter().count(4) == 4
+    finally:
+        instrument.disable()
+    assert instrument.snapshot()['Counter.count'] == {
+        'calls': 5, 'seconds': instrument.snapshot()['Counter.count']['seconds'], 'max_depth': 5}
+
+
+def test_run_batch_instrument():
+    summary = run_batch(10, seed=1, shard_size=5, instrument=True)
+    stats = summary['instrumentation']
+    assert stats['Bot.choose_move']['calls'] == 2 * stats['Bot.move']['calls']
+    assert stats['Board.collapse']['calls'] == summary['collapses']
+    assert instrument.is_enabled() is False
+    assert run_batch(2, seed=1)['instrumentation'] == {}
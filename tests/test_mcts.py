@@ -0,0 +1,99 @@
+from random import Random
+from quantum_tictactoe.mcts import MCTS, ParallelMCTS, rollout, root_statistics
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine, X, Y, parse_move
+
+
+def test_rollout_does_not_change_position():
+    position = Position(BoardEngine())
+    winner = rollout(position.copy(), Random(3))
+    assert winner in [X, Y, 'unknown']
+    assert position.engine.spooky == [0] * 9
+
+
+def test_mcts_iterations():
+    search = MCTS(iterations=200, rng=Random(1))
+    move = search.best_move(Position(BoardEngine()))
+    assert move in Position(BoardEngine()).pair_moves()
+    assert search.stats()['iterations'] == 200
+
+
+def test_mcts_time_limit():
+    search = MCTS(iterations=10 ** 9, time_limit=0.05, rng=Random(1))
+    search.best_move(Position(BoardEngine()))
+    assert search.stats()['seconds'] < 1
+
+
+def test_mcts_without_playouts_budget():
+    position = Position(BoardEngine())
+    search = MCTS(iterations=10 ** 9, time_limit=0.0, rng=Random(1))
+    assert search.best_move(position) in position.pair_moves()
+    assert search.stats()['iterations'] == 1
+    search = MCTS(iterations=0, rng=Random(1))
+    assert search.best_move(position) in position.pair_moves()
+
+
+def test_parallel_mcts_without_playouts_budget():
+    position = Position(BoardEngine())
+    search = ParallelMCTS(workers=2, iterations=0, seed=3)
+    try:
+        assert search.best_move(position) in position.pair_moves()
+    finally:
+        search.close()
+
+
+def test_mcts_takes_winning_collapse():
+    engine = BoardEngine()
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(1, parse_move('x3'))
+    position = Position(engine, X, 5)
+    position.play(2, 5)
+    position.play(2, 5)
+    search = MCTS(iterations=300, rng=Random(2))
+    assert search.best_collapse(position) in [(2, parse_move('x5')), (5, parse_move('y6'))]
+
+
+def test_mcts_reuses_subtree():
+    engine = BoardEngine()
+    for tile, move in enumerate(['x1', 'y2', 'x3', 'y4', 'x5', 'y6']):
+        engine.set_collapsed(tile, parse_move(move))
+    position = Position(engine, X, 7)
+    search = MCTS(iterations=300, rng=Random(4))
+    position.play(*search.best_move(position))
+    assert position.play(*position.pair_moves()[0]) is False
+    search.best_move(position)
+    assert search.stats()['reused'] > 0
+
+
+def test_parallel_mcts_is_reproducible():
+    position = Position(BoardEngine())
+    first = ParallelMCTS(workers=2, iterations=100, seed=7)
+    second = ParallelMCTS(workers=2, iterations=100, seed=7)
+    try:
+        assert first.best_move(position) == second.best_move(position)
+        assert first.stats()['iterations'] == 200
+    finally:
+        first.close()
+        second.close()
+
+
+def test_root_statistics_from_packed_position():
+    position = Position(BoardEngine())
+    position.play(0, 4)
+    statistics = root_statistics(position.pack(), 50, None, 'seed')
+    assert sum(visits for _, visits, _ in statistics) == 50
+    assert all(action in position.pair_moves() for action, _, _ in statistics)
+
+
+def test_mcts_finished_game():
+    engine = BoardEngine()
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(1, parse_move('x3'))
+    engine.set_collapsed(2, parse_move('x5'))
+    position = Position(engine, X, 7)
+    search = MCTS(iterations=10, rng=Random(1))
+    assert search.best_move(position) is None
+    assert search.best_collapse(position) is None
+    search = ParallelMCTS(workers=2, iterations=10, seed=1)
+    assert search.best_move(position) is None
+    search.close()
@@ -0,0 +1,63 @@
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine, X, Y, parse_move
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.game import Game
+
+
+def test_position_pair_moves():
+    position = Position(BoardEngine())
+    assert len(position.pair_moves()) == 36
+    position.place(4)
+    assert position.pair_moves() == [(4, 0), (4, 1), (4, 2), (4, 3),
+                                     (4, 5), (4, 6), (4, 7), (4, 8)]
+
+
+def test_position_play_and_collapse():
+    position = Position(BoardEngine())
+    assert position.play(0, 1) is False
+    assert position.player == Y
+    assert position.play(0, 1) is True
+    assert position.pending == parse_move('y2')
+    assert position.pair_moves() == []
+    assert position.collapse_options() == [(0, parse_move('x1')), (0, parse_move('y2')),
+                                           (1, parse_move('x1')), (1, parse_move('y2'))]
+    changed = position.collapse(0, parse_move('x1'))
+    assert changed == [(0, parse_move('x1')), (1, parse_move('y2'))]
+    assert position.player == X
+    assert position.winner() is None
+
+
+def test_position_copy_is_independent():
+    position = Position(BoardEngine())
+    copy = position.copy()
+    copy.play(2, 3)
+    assert position.engine.spooky == [0] * 9
+    assert position.number == 1
+
+
+def test_position_from_game():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    board = Board(tiles)
+    game = Game(board)
+    game.move(3)
+    game.set_first_move(False)
+    position = Position.from_game(game)
+    assert position.half == 3
+    assert position.move() == parse_move('x1')
+    position.place(5)
+    assert board.tiles()[5].array() == []
+
+
+def test_position_pack_unpack():
+    position = Position(BoardEngine())
+    position.play(0, 1)
+    position.play(1, 2)
+    position.play(2, 0)
+    data = position.pack()
+    assert len(data) == 87
+    copy = Position.unpack(data)
+    assert copy.key() == position.key()
+    assert copy.collapse_options() == position.collapse_options()
@@ -0,0 +1,91 @@
+from quantum_tictactoe.record import MOVE, COLLAPSE, RecordError, RecordReader, RecordWriter
+from quantum_tictactoe.record import encode_record, decode_record, replay, positions
+from quantum_tictactoe.simulate import Simulator
+from quantum_tictactoe.engine import parse_move
+import pytest
+
+GAME = [(MOVE, 0, 1), (MOVE, 1, 0), (COLLAPSE, 0, parse_move('x1'))]
+
+
+def test_encode_and_decode_record():
+    data = encode_record(GAME)
+    assert len(data) == 4
+    assert decode_record(data) == GAME
+
+
+def test_replay():
+    game = replay(GAME)
+    assert game.board.analyse_board()[:2] == [parse_move('x1'), parse_move('y2')]
+    assert game.counter() == 3
+    assert game.entanglement is False
+
+
+def test_positions():
+    found = list(positions(GAME))
+    assert len(found) == 3
+    assert found[1].pending == parse_move('y2')
+    assert found[2].engine.owner[0] == parse_move('x1')
+
+
+def test_write_and_read_records(tmp_path):
+    path = str(tmp_path / 'games')
+    with RecordWriter(path) as writer:
+        writer.write(GAME)
+    with RecordWriter(path) as writer:
+        writer.write(GAME[:1])
+    assert list(RecordReader(path)) == [GAME, GAME[:1]]
+
+
+def test_read_broken_records(tmp_path):
+    path = tmp_path / 'games'
+    path.write_bytes(b'nothing')
+    with pytest.raises(RecordError):
+        list(RecordReader(str(path)))
+    path.unlink()
+    with RecordWriter(str(path)) as writer:
+        writer.write(GAME)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(RecordError):
+        list(RecordReader(str(path)))
+
+
+def test_decode_broken_record():
+    with pytest.raises(RecordError):
+        decode_record(b'\x81')
+
+
+def test_writer_checks_header(tmp_path):
+    path = tmp_path / 'games'
+    path.write_bytes(b'nothing')
+    with pytest.raises(RecordError):
+        RecordWriter(str(path))
+    assert path.read_bytes() == b'nothing'
+
+
+def test_simulator_writes_records(tmp_path):
+    path = str(tmp_path / 'games')
+    with RecordWriter(path) as writer:
+        results = Simulator('easy', 'easy', seed=1, writer=writer).run(20)
+    for (winner, length, collapses), actions in zip(results, RecordReader(path)):
+        game = replay(actions)
+        assert game.is_finished() is True
+        assert game.board.is_winner()[0] == winner
+        assert game.counter() - 1 == length
+        assert sum(kind == COLLAPSE for kind, _, _ in actions) == collapses
+
+
+class ListWriter:
+    def __init__(self):
+        self.games = []
+
+    def write(self, actions):
+        self.games.append(actions)
+
+
+def test_simulator_passes_record_kinds():
+    writer = ListWriter()
+    results = Simulator('easy', 'easy', seed=2, writer=writer).run(5)
+    assert len(writer.games) == 5
+    for (_, _, collapses), actions in zip(results, writer.games):
+        assert {kind for kind, _, _ in actions} <= {MOVE, COLLAPSE}
+        assert sum(kind == COLLAPSE for kind, _, _ in actions) == collapses
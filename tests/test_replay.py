@@ -0,0 +1,49 @@
+from quantum_tictactoe.replay import Replay
+from quantum_tictactoe.record import RecordReader, RecordWriter, replay, new_game
+from quantum_tictactoe.simulate import Simulator
+from quantum_tictactoe.position import Position
+import pytest
+
+
+def played_games(tmp_path, games):
+    path = str(tmp_path / 'games')
+    with RecordWriter(path) as writer:
+        Simulator('easy', 'easy', seed=3, writer=writer).run(games)
+    return list(RecordReader(path))
+
+
+def test_replay_positions_match_game(tmp_path):
+    for actions in played_games(tmp_path, 10):
+        recorded = Replay(actions, interval=3)
+        assert len(recorded) == len(actions)
+        for ply in range(len(actions) + 1):
+            game = replay(actions[:ply])
+            assert recorded.position(ply).key() == game.key()
+
+
+def test_replay_game(tmp_path):
+    actions = played_games(tmp_path, 1)[0]
+    recorded = Replay(actions)
+    end = recorded.game(len(actions))
+    full = replay(actions)
+    assert end.board.analyse_board() == full.board.analyse_board()
+    assert end.is_finished() is True
+    assert end.game_result() == full.game_result()
+    assert end.last_move() == full.last_move()
+    assert end.last_tile() == full.last_tile()
+    middle = recorded.game(3, new_game())
+    assert middle.key() == replay(actions[:3]).key()
+    assert Position.from_game(middle).key() == middle.key()
+
+
+def test_replay_continues_from_seek(tmp_path):
+    actions = played_games(tmp_path, 1)[0]
+    game = Replay(actions).game(2)
+    replay(actions[2:], game)
+    assert game.board.analyse_board() == replay(actions).board.analyse_board()
+
+
+def test_replay_wrong_ply():
+    with pytest.raises(IndexError):
+        Replay([]).position(1)
+    assert Replay([]).position(0).number == 1
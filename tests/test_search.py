@@ -0,0 +1,64 @@
+from quantum_tictactoe.search import AlphaBeta, evaluate, order_collapses
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine, X, parse_move
+
+
+def test_search_takes_winning_collapse():
+    engine = BoardEngine()
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(1, parse_move('x3'))
+    position = Position(engine, X, 5)
+    position.play(2, 5)
+    position.play(2, 5)
+    search = AlphaBeta(depth=2)
+    assert search.best_collapse(position) in [(2, parse_move('x5')), (5, parse_move('y6'))]
+    assert position.pending == parse_move('y6')
+
+
+def test_order_collapses():
+    engine = BoardEngine()
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(1, parse_move('x3'))
+    position = Position(engine, X, 5)
+    position.play(2, 5)
+    position.play(2, 5)
+    ordered = order_collapses(position, position.collapse_options())
+    assert sorted(ordered) == sorted(position.collapse_options())
+    assert set(ordered[:2]) == {(2, parse_move('x5')), (5, parse_move('y6'))}
+
+
+def test_search_respects_node_limit():
+    search = AlphaBeta(depth=5, node_limit=50)
+    move = search.best_move(Position(BoardEngine()))
+    assert move in Position(BoardEngine()).pair_moves()
+    assert search.stats()['nodes'] <= 51
+    assert search.stats()['depth'] < 5
+
+
+def test_search_stats():
+    search = AlphaBeta(depth=1)
+    search.best_move(Position(BoardEngine()))
+    stats = search.stats()
+    assert stats['nodes'] == 36
+    assert stats['depth'] == 1
+    assert stats['nodes_per_second'] > 0
+
+
+def test_search_finished_game():
+    engine = BoardEngine()
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(1, parse_move('x3'))
+    engine.set_collapsed(2, parse_move('x5'))
+    position = Position(engine, X, 7)
+    assert position.is_finished() is True
+    search = AlphaBeta(depth=2)
+    assert search.best_move(position) is None
+    assert search.best_collapse(position) is None
+    assert search.stats()['nodes'] == 0
+
+
+def test_evaluate_counts_open_lines():
+    engine = BoardEngine()
+    engine.set_collapsed(4, parse_move('x1'))
+    assert evaluate(Position(engine, X, 2)) > 0
+    assert evaluate(Position(engine, 1, 2)) < 0
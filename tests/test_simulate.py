@@ -0,0 +1,50 @@
+from quantum_tictactoe.simulate import Simulator, PHASES, run_batch, run_shard
+from quantum_tictactoe.tracer import BOT_MOVE
+from quantum_tictactoe.bot import BotTypeError
+import pytest
+
+
+def test_simulator_play_game():
+    simulator = Simulator('easy', 'easy')
+    winner, length, collapses = simulator.play_game()
+    assert winner in ['x', 'y', 'unknown']
+    assert length >= 3
+    assert collapses >= 1
+
+
+def test_simulator_report():
+    simulator = Simulator('easy', 'hard', y_options={'depth': 1})
+    results = simulator.run(3)
+    report = simulator.report()
+    assert len(results) == 3
+    assert report['games'] == 3
+    assert report['games_per_second'] > 0
+    assert set(report['phases']) == set(PHASES)
+    assert report['phases'][BOT_MOVE]['calls'] == sum(length for _, length, _ in results)
+    assert report['phases']['collapse']['calls'] == sum(count for _, _, count in results)
+
+
+def test_simulator_needs_two_bots():
+    with pytest.raises(BotTypeError):
+        Simulator('none', 'easy')
+
+
+def test_simulator_seed_is_reproducible():
+    first = Simulator('easy', 'easy', seed=5).run(20)
+    second = Simulator('easy', 'easy', seed=5).run(20)
+    assert first == second
+
+
+def test_run_shard():
+    summary = run_shard('easy', 'easy', 10, 'seed')
+    assert summary['games'] == 10
+    assert summary['x'] + summary['y'] + summary['unknown'] == 10
+    assert summary == {**run_shard('easy', 'easy', 10, 'seed'), 'phases': summary['phases']}
+
+
+def test_run_batch_does_not_depend_on_workers():
+    single = run_batch(30, workers=1, seed=2, shard_size=10)
+    pooled = run_batch(30, workers=2, seed=2, shard_size=10)
+    for key in ['games', 'x', 'y', 'unknown', 'moves', 'collapses']:
+        assert single[key] == pooled[key]
+    assert single['games'] == 30
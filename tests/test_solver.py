@@ -0,0 +1,54 @@
+from quantum_tictactoe.solver import Solver, WIN, DRAW, LOSS, openings, solve_openings
+from quantum_tictactoe.solver import save_memo, load_memo
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine, X, Y, parse_move
+from tests.helpers import late_position
+
+
+def test_solver_finished_position():
+    engine = BoardEngine()
+    engine.set_collapsed(0, parse_move('x1'))
+    engine.set_collapsed(1, parse_move('x3'))
+    engine.set_collapsed(2, parse_move('x5'))
+    assert Solver().solve(Position(engine, Y, 6)) == LOSS
+    assert Solver().solve(Position(engine, X, 7)) == WIN
+
+
+def test_solver_late_position():
+    solver = Solver()
+    assert solver.solve(late_position()) == DRAW
+    action, value = solver.best_action(late_position())
+    assert action in late_position().pair_moves()
+    assert value == DRAW
+    assert solver.stats()['positions'] > 0
+
+
+def test_solver_checkpoint_resume(tmp_path):
+    path = str(tmp_path / 'memo')
+    solver = Solver(path, checkpoint_every=100)
+    solver.solve(late_position())
+    solver.save()
+    assert load_memo(path) == solver.memo()
+    resumed = Solver(path)
+    assert resumed.solve(late_position()) == DRAW
+    assert resumed.stats()['nodes'] == 1
+
+
+def test_save_and_load_memo(tmp_path):
+    path = str(tmp_path / 'memo')
+    save_memo(path, {2 ** 64 - 1: WIN, 5: LOSS})
+    assert load_memo(path) == {2 ** 64 - 1: WIN, 5: LOSS}
+
+
+def test_openings_are_canonical():
+    assert len(openings(Position(BoardEngine()))) == 8
+
+
+def test_solve_openings_does_not_depend_on_workers(tmp_path):
+    single = solve_openings(late_position(), 1)
+    pooled = solve_openings(late_position(), 2, str(tmp_path / 'memo'))
+    assert single['value'] == pooled['value'] == DRAW
+    assert single['openings'] == pooled['openings']
+    resumed = solve_openings(late_position(), 1, str(tmp_path / 'memo'))
+    assert resumed['openings'] == single['openings']
+    assert resumed['nodes'] == len(single['openings'])
@@ -0,0 +1,73 @@
+from quantum_tictactoe.symmetry import TRANSFORMS, INVERSE, map_tile, map_mask, map_action
+from quantum_tictactoe.symmetry import unmap_action, transform_position, transformed_key
+from quantum_tictactoe.symmetry import canonical, canonical_key, canonical_game
+from quantum_tictactoe.position import Position
+from quantum_tictactoe.engine import BoardEngine, X, parse_move
+from quantum_tictactoe.game import Game
+from quantum_tictactoe.board import Board
+from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.search import AlphaBeta
+
+
+def test_transforms():
+    assert len(set(TRANSFORMS)) == 8
+    assert TRANSFORMS[0] == tuple(range(9))
+    assert map_tile(0, 1) == 2
+    assert map_tile(4, 5) == 4
+    assert map_tile(-1, 3) == -1
+    assert map_mask(0b11, 2) == 0b110000000
+    for transform, inverse in enumerate(INVERSE):
+        for tile in range(9):
+            assert map_tile(map_tile(tile, transform), inverse) == tile
+
+
+def test_transform_position():
+    position = Position(BoardEngine())
+    position.play(0, 1)
+    position.play(1, 5)
+    rotated = transform_position(position, 1)
+    assert rotated.engine.moves(2) == [parse_move('x1')]
+    assert rotated.engine.moves(5) == [parse_move('x1'), parse_move('y2')]
+    assert rotated.key() == transformed_key(position, 1)
+    assert rotated.player == position.player
+
+
+def test_map_action():
+    position = Position(BoardEngine())
+    assert map_action((0, 1), 1, position) == (2, 5)
+    assert unmap_action((2, 5), 1, position) == (0, 1)
+    position.place(8)
+    assert map_action((8, 0), 0, position) == (8, 0)
+
+
+def test_canonical_is_same_for_symmetric_positions():
+    position = Position(BoardEngine())
+    position.play(0, 4)
+    corner = Position(BoardEngine())
+    corner.play(4, 8)
+    key, transform = canonical_key(position)
+    assert canonical_key(corner)[0] == key
+    representative, transform = canonical(position)
+    assert representative.key() == key
+    assert unmap_action(map_action((1, 2), transform, position), transform,
+                        representative) == (1, 2)
+
+
+def test_canonical_game():
+    tiles = []
+    for _ in range(9):
+        tiles.append(Tile())
+    game = Game(Board(tiles))
+    game.make_move(2, 4)
+    position, _ = canonical_game(game)
+    assert position.key() == canonical_key(Position.from_game(game))[0]
+    assert position.player != X
+
+
+def test_symmetric_search_visits_fewer_nodes():
+    plain = AlphaBeta(depth=3)
+    plain.best_move(Position(BoardEngine()))
+    symmetric = AlphaBeta(depth=3, symmetric=True)
+    move = symmetric.best_move(Position(BoardEngine()))
+    assert move in Position(BoardEngine()).pair_moves()
+    assert symmetric.stats()['nodes'] < plain.stats()['nodes']
@@ -0,0 +1,57 @@
+from quantum_tictactoe.table import TranspositionTable
+import pytest
+
+
+def test_table_store_and_get():
+    table = TranspositionTable(10)
+    assert table.get(1) is None
+    table.store(1, 2, 5, 0, (0, 1))
+    assert table.get(1) == (2, 5, 0, (0, 1))
+    assert 1 in table
+    assert table.stats()['hits'] == 1
+    assert table.stats()['misses'] == 1
+
+
+def test_table_replace_depth():
+    table = TranspositionTable(10)
+    table.store(1, 3, 5, 0, (0, 1))
+    table.store(1, 2, 7, 0, (0, 2))
+    assert table.get(1) == (3, 5, 0, (0, 1))
+    table.store(1, 3, 8, 0, (0, 3))
+    assert table.get(1) == (3, 8, 0, (0, 3))
+
+
+def test_table_replace_always():
+    table = TranspositionTable(10, replace='always')
+    table.store(1, 3, 5, 0, (0, 1))
+    table.store(1, 2, 7, 0, (0, 2))
+    assert table.get(1) == (2, 7, 0, (0, 2))
+
+
+def test_table_evict_lru():
+    table = TranspositionTable(2)
+    table.store(1, 1, 0, 0, None)
+    table.store(2, 1, 0, 0, None)
+    table.get(1)
+    table.store(3, 1, 0, 0, None)
+    assert 1 in table
+    assert 2 not in table
+    assert len(table) == 2
+    assert table.stats()['evictions'] == 1
+
+
+def test_table_evict_fifo():
+    table = TranspositionTable(2, evict='fifo')
+    table.store(1, 1, 0, 0, None)
+    table.store(2, 1, 0, 0, None)
+    table.get(1)
+    table.store(3, 1, 0, 0, None)
+    assert 1 not in table
+    assert 2 in table
+
+
+def test_table_wrong_policy():
+    with pytest.raises(ValueError):
+        TranspositionTable(10, replace='never')
+    with pytest.raises(ValueError):
+        TranspositionTable(10, evict='random')
@@ -1,4 +1,5 @@
 from quantum_tictactoe.tile import Tile
+from quantum_tictactoe.engine import parse_move
 
 
 def test_create_tile_with_defaults():
@@ -7,16 +8,16 @@ def test_create_tile_with_defaults():
 
 
 def test_create_tile_with_parameters():
-    tile = Tile(['x1', 'x1'], True, False)
-    assert tile.array() == ['x1', 'x1']
+    tile = Tile([parse_move('x1'), parse_move('x1')], True, False)
+    assert tile.array() == [parse_move('x1'), parse_move('x1')]
     assert tile.is_entanglement() is True
 
 
 def test_set_collapsed():
     tile = Tile()
-    tile.set_collapsed('x1')
+    tile.set_collapsed(parse_move('x1'))
     assert tile.is_collapsed() is True
-    assert tile.array() == ['x1', 'x1', 'x1']
+    assert tile.array() == [parse_move('x1'), parse_move('x1'), parse_move('x1')]
 
 
 def test_set_is_entanglement():
@@ -28,13 +29,13 @@ def test_set_is_entanglement():
 def test_set_move_on_tile():
     tile = Tile()
     assert tile.array() == []
-    tile.set_move_on_tile('x1')
-    assert tile.array() == ['x1']
+    tile.set_move_on_tile(parse_move('x1'))
+    assert tile.array() == [parse_move('x1')]
 
 
 def test_clear_tile():
-    tile = Tile(['x1'], True, True)
-    assert tile.array() == ['x1']
+    tile = Tile([parse_move('x1')], True, True)
+    assert tile.array() == [parse_move('x1')]
     assert tile.is_collapsed() is True
     assert tile.is_entanglement() is True
     tile.clear_tile()
@@ -43,7 +44,7 @@ def test_clear_tile():
 
 
 def test_remove_move():
-    tile = Tile(['x1'])
-    assert tile.array() == ['x1']
-    tile.remove_move('x1')
+    tile = Tile([parse_move('x1')])
+    assert tile.array() == [parse_move('x1')]
+    tile.remove_move(parse_move('x1'))
     assert tile.array() == []
@@ -0,0 +1,59 @@
+from quantum_tictactoe.tracer import Tracer, span
+from quantum_tictactoe import tracer as trace_phases
+from quantum_tictactoe.simulate import Simulator, PHASES, run_batch
+import json
+import pytest
+
+
+def test_tracer_span():
+    tracer = Tracer()
+    with tracer.span('collapse', turn=3):
+        pass
+    assert len(tracer.events) == 1
+    event = tracer.events[0]
+    assert event['name'] == 'collapse'
+    assert event['ph'] == 'X'
+    assert event['ts'] >= 0
+    assert event['dur'] >= 0
+    assert event['args'] == {'turn': 3}
+
+
+def test_tracer_span_on_error():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span('move'):
+            raise ValueError
+    assert len(tracer.events) == 1
+
+
+def test_span_without_tracer():
+    with span(None, 'move', turn=1):
+        pass
+
+
+def test_tracer_write(tmp_path):
+    tracer = Tracer()
+    with span(tracer, 'win check'):
+        pass
+    path = tmp_path / 'trace.json'
+    tracer.write(path)
+    with open(path) as handle:
+        data = json.load(handle)
+    assert data['traceEvents'][0]['name'] == 'win check'
+
+
+def test_simulator_tracer():
+    tracer = Tracer()
+    simulator = Simulator('easy', 'easy', seed=0, tracer=tracer)
+    simulator.run(2)
+    report = simulator.report()
+    names = [event['name'] for event in tracer.events]
+    for phase in PHASES:
+        assert names.count(phase) == report['phases'][phase]['calls']
+    assert {event['args']['game'] for event in tracer.events} == {0, 1}
+    assert set(names) <= set(trace_phases.PHASES)
+
+
+def test_run_batch_tracer_needs_one_worker():
+    with pytest.raises(ValueError):
+        run_batch(2, workers=2, tracer=Tracer())